@@ -1,10 +1,20 @@
 // Content script for Google search results fact-checking
+
+// Mirrors python-service/verdict_store.py: URL canonicalization and Bloom filter layout
+const TRACKING_PARAMS = new Set(['fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', 'ref_src']);
+const BLOOM_REFRESH_MS = 5 * 60 * 1000;
+const BLOOM_STORAGE_KEY = 'verdictBloom';
+
 class TruthlyExtension {
   constructor() {
     this.serverUrl = 'http://localhost:5000';
     this.frontendUrl = 'http://localhost:3000';
     this.processingResults = new Set();
     this.cache = new Map();
+    this.verdictBloom = null;
+    this.bloomEtag = null;
+    this.bloomLoadedAt = 0;
+    this.bloomLoading = null;
     this.settings = {
       enabled: true,
       autoAnalyze: true,
@@ -24,6 +34,8 @@ class TruthlyExtension {
       return;
     }
 
+    // Not awaited: until the filter is available, lookups simply ask the server
+    this.loadVerdictBloom();
     this.waitForSearchResults();
     
     // Listen for dynamic content changes
@@ -141,7 +153,8 @@ class TruthlyExtension {
 
       this.addLoadingIndicator(result);
 
-      const analysis = await this.analyzeUrl(url, title);
+      // Reuse a stored verdict before asking the server to scrape and analyze the page
+      const analysis = await this.lookupVerdict(url) || await this.analyzeUrl(url, title);
       
       if (analysis && analysis.success && analysis.data) {
         if (this.settings.cacheResults) {
@@ -162,6 +175,134 @@ class TruthlyExtension {
     }
   }
 
+  loadVerdictBloom() {
+    if (!this.bloomLoading) {
+      this.bloomLoading = this.refreshVerdictBloom().finally(() => {
+        this.bloomLoading = null;
+      });
+    }
+    return this.bloomLoading;
+  }
+
+  async refreshVerdictBloom() {
+    // The filter is kept in extension storage so page loads reuse it instead of downloading it again
+    if (!this.verdictBloom) {
+      const stored = await new Promise((resolve) => {
+        chrome.storage.local.get([BLOOM_STORAGE_KEY], (result) => resolve(result[BLOOM_STORAGE_KEY]));
+      });
+      if (stored) {
+        this.useVerdictBloom(stored);
+      }
+    }
+    if (this.verdictBloom && Date.now() - this.bloomLoadedAt < BLOOM_REFRESH_MS) {
+      return;
+    }
+
+    try {
+      const response = await fetch(`${this.serverUrl}/api/verdict/bloom`, {
+        headers: this.bloomEtag ? { 'If-None-Match': `"${this.bloomEtag}"` } : {}
+      });
+      if (response.status === 304) {
+        this.bloomLoadedAt = Date.now();
+        chrome.storage.local.get([BLOOM_STORAGE_KEY], (result) => {
+          if (result[BLOOM_STORAGE_KEY]) {
+            chrome.storage.local.set({ [BLOOM_STORAGE_KEY]: { ...result[BLOOM_STORAGE_KEY], loadedAt: this.bloomLoadedAt } });
+          }
+        });
+        return;
+      }
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      const bloom = await response.json();
+      const entry = { size: bloom.size, hashes: bloom.hashes, bits: bloom.bits, etag: bloom.etag, loadedAt: Date.now() };
+      this.useVerdictBloom(entry);
+      chrome.storage.local.set({ [BLOOM_STORAGE_KEY]: entry });
+    } catch (error) {
+      // A stale filter only causes extra analyses for newly stored URLs, so keep it if we have one
+      console.warn('Truthly Extension: Verdict Bloom filter unavailable', error);
+    }
+  }
+
+  useVerdictBloom(entry) {
+    this.verdictBloom = {
+      size: BigInt(entry.size),
+      hashes: entry.hashes,
+      bits: Uint8Array.from(atob(entry.bits), c => c.charCodeAt(0))
+    };
+    this.bloomEtag = entry.etag || null;
+    this.bloomLoadedAt = entry.loadedAt;
+  }
+
+  canonicalizeUrl(rawUrl) {
+    const parsed = new URL(rawUrl.trim());
+    const scheme = parsed.protocol.replace(':', '').toLowerCase();
+    let host = parsed.hostname.toLowerCase();
+    if (host.startsWith('www.')) {
+      host = host.slice(4);
+    }
+    if (parsed.port) {
+      host += `:${parsed.port}`; // URL already drops default ports
+    }
+
+    let path = parsed.pathname || '/';
+    if (path.length > 1) {
+      path = path.replace(/\/+$/, '') || '/';
+    }
+
+    const params = parsed.search.replace(/^\?/, '').split('&').filter(pair => {
+      const key = pair.split('=')[0].toLowerCase();
+      return pair && !key.startsWith('utm_') && !TRACKING_PARAMS.has(key);
+    }).sort();
+
+    return `${scheme}://${host}${path}${params.length ? `?${params.join('&')}` : ''}`;
+  }
+
+  async mightHaveVerdict(url) {
+    if (Date.now() - this.bloomLoadedAt > BLOOM_REFRESH_MS) {
+      this.loadVerdictBloom();
+    }
+    if (!this.verdictBloom) {
+      return true; // no filter: fall back to asking the server
+    }
+
+    const encoded = new TextEncoder().encode(this.canonicalizeUrl(url));
+    const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', encoded));
+    const readUint64 = (offset) => digest.slice(offset, offset + 8)
+      .reduce((value, byte) => (value << 8n) | BigInt(byte), 0n);
+    const h1 = readUint64(0);
+    const h2 = readUint64(8) | 1n;
+
+    const { size, hashes, bits } = this.verdictBloom;
+    for (let i = 0; i < hashes; i++) {
+      const index = Number((h1 + BigInt(i) * h2) % size);
+      if (!(bits[index >> 3] & (1 << (index & 7)))) {
+        return false;
+      }
+    }
+    return true;
+  }
+
+  async lookupVerdict(url) {
+    try {
+      if (!(await this.mightHaveVerdict(url))) {
+        return null; // never analyzed: skip the lookup entirely
+      }
+
+      const response = await fetch(`${this.serverUrl}/api/verdict?url=${encodeURIComponent(url)}`);
+      if (!response.ok) {
+        return null;
+      }
+
+      const data = await response.json();
+      return data.success && data.found ? data : null;
+
+    } catch (error) {
+      console.warn('Truthly Extension: Verdict lookup failed', error);
+      return null;
+    }
+  }
+
   async analyzeUrl(url, title) {
     try {
       console.log(`Truthly Extension: Analyzing ${url}`);
@@ -13,6 +13,9 @@ app.use(express.json({ limit: '10mb' }));
 
 // Python service configuration
 const PYTHON_SERVICE_URL = 'http://localhost:5001';
+// Only request the analysis fields we use; full responses carry every voter's details
+const RSS_ANALYSIS_FIELDS = ['label', 'confidence', 'summary', 'reasoning'];
+const ANALYSIS_FIELDS = [...RSS_ANALYSIS_FIELDS, 'fake_probability', 'real_probability', 'model'];
 
 // RSS Parser
 const parser = new Parser({
@@ -249,7 +252,9 @@ app.post('/api/search-topic', async (req, res) => {
             // Analyze with full extracted content
             const pythonResponse = await axios.post(`${PYTHON_SERVICE_URL}/analyze`, {
               title: extracted.title,
-              content: extracted.content
+              content: extracted.content,
+              priority: 'batch',
+              fields: RSS_ANALYSIS_FIELDS
             }, { timeout: 20000 });
 
             if (pythonResponse.data.success) {
@@ -298,7 +303,9 @@ app.post('/api/search-topic', async (req, res) => {
             
             const directResponse = await axios.post(`${PYTHON_SERVICE_URL}/analyze`, {
               title: article.title,
-              content: textContent
+              content: textContent,
+              priority: 'batch',
+              fields: RSS_ANALYSIS_FIELDS
             }, { timeout: 15000 });
 
             if (directResponse.data.success) {
@@ -446,7 +453,10 @@ app.post('/api/analyze', async (req, res) => {
     // Call Python service
     const pythonResponse = await axios.post(`${PYTHON_SERVICE_URL}/analyze`, {
       title: analysisData.title,
-      content: analysisData.content
+      content: analysisData.content,
+      priority: 'interactive',
+      fields: ANALYSIS_FIELDS,
+      url: analysisData.originalUrl || undefined
     }, { timeout: 30000 });
 
     if (pythonResponse.data.success) {
@@ -467,6 +477,7 @@ app.post('/api/analyze', async (req, res) => {
           },
           model: analysis.model || 'Comprehensive-Ensemble',
           analyzedAt: new Date().toISOString(),
+          processingMode: pythonResponse.data.processing_mode || 'full',
           source: analysisData.source,
           extractionInfo: analysisData.extractionInfo || null
         }
@@ -486,6 +497,75 @@ app.post('/api/analyze', async (req, res) => {
   }
 });
 
+// Stored verdict for an already-analyzed URL (no scraping or analysis)
+app.get('/api/verdict', async (req, res) => {
+  try {
+    const { url } = req.query;
+    if (!url) {
+      return res.status(400).json({
+        success: false,
+        error: 'url query parameter is required'
+      });
+    }
+
+    const lookup = await axios.get(`${PYTHON_SERVICE_URL}/verdict`, { params: { url }, timeout: 2000 });
+    if (!lookup.data.found) {
+      return res.json({ success: true, found: false });
+    }
+
+    const analysis = lookup.data.analysis;
+    res.json({
+      success: true,
+      found: true,
+      data: {
+        url,
+        label: analysis.label,
+        confidence: analysis.confidence,
+        summary: analysis.summary,
+        reasoning: analysis.reasoning,
+        probabilities: {
+          fake: analysis.fake_probability || (100 - analysis.confidence),
+          real: analysis.real_probability || analysis.confidence
+        },
+        model: 'Verdict-Store',
+        analyzedAt: new Date(lookup.data.analyzed_at * 1000).toISOString(),
+        processingMode: 'stored',
+        source: 'verdict-store'
+      }
+    });
+  } catch (error) {
+    console.error('Verdict lookup error:', error.message);
+    res.status(502).json({
+      success: false,
+      error: error.message || 'Verdict lookup failed'
+    });
+  }
+});
+
+// Bloom filter of stored URL hashes, so the extension can skip lookups for unseen URLs
+app.get('/api/verdict/bloom', async (req, res) => {
+  try {
+    const ifNoneMatch = req.get('If-None-Match');
+    const bloom = await axios.get(`${PYTHON_SERVICE_URL}/verdict/bloom`, {
+      timeout: 5000,
+      headers: ifNoneMatch ? { 'If-None-Match': ifNoneMatch } : {},
+      validateStatus: status => status === 200 || status === 304
+    });
+    if (bloom.headers.etag) {
+      res.set('ETag', bloom.headers.etag);
+    }
+    if (bloom.status === 304) {
+      return res.status(304).end();
+    }
+    res.json(bloom.data);
+  } catch (error) {
+    res.status(502).json({
+      success: false,
+      error: error.message || 'Bloom filter unavailable'
+    });
+  }
+});
+
 // Health check
 app.get('/api/health', async (req, res) => {
   try {
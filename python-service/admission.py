@@ -0,0 +1,135 @@
+"""
+Priority admission control for full-ensemble analyses.
+
+A fixed number of slots bounds how many comprehensive ensemble runs execute
+at once. Each priority class (e.g. interactive, batch) has its own bounded
+wait queue, queue timeout, optional cap on how many slots it may hold and an
+overload action. Higher-priority waiters are always served first; when a
+class's queue is full or its wait times out, the request is either degraded
+to the quick heuristic path or shed.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+ADMITTED = 'admitted'
+DEGRADED = 'degraded'
+SHED = 'shed'
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed by admission control"""
+
+    def __init__(self, priority, retry_after=1):
+        super().__init__(f"Service overloaded, {priority} request shed")
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+class PriorityClass:
+    """Limits and overload behaviour for one priority class"""
+
+    def __init__(self, name, max_queue, queue_timeout_ms, max_concurrent=None, on_overload=DEGRADED):
+        if on_overload not in (DEGRADED, SHED):
+            raise ValueError(f"on_overload must be '{DEGRADED}' or '{SHED}'")
+        self.name = name
+        self.max_queue = max_queue
+        self.queue_timeout_ms = queue_timeout_ms
+        self.max_concurrent = max_concurrent
+        self.on_overload = on_overload
+        self.waiting = 0
+        self.running = 0
+        self.counts = {ADMITTED: 0, DEGRADED: 0, SHED: 0}
+
+
+class AdmissionController:
+    """Slot-based admission with strict priority between classes"""
+
+    def __init__(self, capacity, classes):
+        # `classes` is ordered highest priority first
+        self.capacity = capacity
+        self.classes = {c.name: c for c in classes}
+        self.order = [c.name for c in classes]
+        self.running = 0
+        self._cond = threading.Condition()
+
+    def _can_run(self, cls):
+        if self.running >= self.capacity:
+            return False
+        if cls.max_concurrent is not None and cls.running >= cls.max_concurrent:
+            return False
+        # Don't overtake a waiting higher-priority class
+        for name in self.order:
+            if name == cls.name:
+                return True
+            if self.classes[name].waiting:
+                return False
+        return True
+
+    def acquire(self, priority):
+        """Block until admitted, or return the class's overload action"""
+        cls = self.classes.get(priority) or self.classes[self.order[-1]]
+        with self._cond:
+            if not cls.waiting and self._can_run(cls):
+                return self._admit(cls)
+            if cls.waiting >= cls.max_queue:
+                cls.counts[cls.on_overload] += 1
+                return cls.on_overload
+
+            cls.waiting += 1
+            deadline = time.monotonic() + cls.queue_timeout_ms / 1000
+            try:
+                while not self._can_run(cls):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        cls.counts[cls.on_overload] += 1
+                        return cls.on_overload
+                    self._cond.wait(remaining)
+            finally:
+                cls.waiting -= 1
+                # Lower-priority waiters may now be able to run
+                self._cond.notify_all()
+            return self._admit(cls)
+
+    def _admit(self, cls):
+        cls.running += 1
+        self.running += 1
+        cls.counts[ADMITTED] += 1
+        return ADMITTED
+
+    def release(self, priority):
+        cls = self.classes.get(priority) or self.classes[self.order[-1]]
+        with self._cond:
+            cls.running -= 1
+            self.running -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def admit(self, priority):
+        """Context manager yielding the admission decision; releases the slot if one was taken"""
+        decision = self.acquire(priority)
+        try:
+            yield decision
+        finally:
+            if decision == ADMITTED:
+                self.release(priority)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'capacity': self.capacity,
+                'running': self.running,
+                'classes': {
+                    name: {
+                        'queue_depth': cls.waiting,
+                        'max_queue': cls.max_queue,
+                        'running': cls.running,
+                        'max_concurrent': cls.max_concurrent,
+                        'on_overload': cls.on_overload,
+                        'admitted': cls.counts[ADMITTED],
+                        'degraded': cls.counts[DEGRADED],
+                        'shed': cls.counts[SHED]
+                    }
+                    for name, cls in self.classes.items()
+                }
+            }
@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 from flask_cors import CORS
 import logging
 import sys
@@ -7,9 +7,23 @@ import os
 import asyncio
 import aiohttp
 import requests
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from collections import OrderedDict
+import copy
+import hashlib
+from array import array
+import threading
 import json
 from dotenv import load_dotenv
+from cassettes import CassetteStore
+from voter_policy import BudgetVoterPolicy, VoterStats, create_policy, parse_budget
+from admission import AdmissionController, PriorityClass, Overloaded, ADMITTED, DEGRADED
+from process_pool import InferenceProcessPool
+from model_registry import ModelRegistry
+from responses import FastJSONProvider, parse_fields, project_analysis
+from verdict_store import VerdictStore
+from shared_cache import create_cache
+from pipeline_batcher import MicroBatcher
 
 load_dotenv()  # Load environment variables from .env file
 
@@ -18,19 +32,356 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)
 
 # Global model storage
 models = {}
 device = None
 
+# Token budgets per consumer (content tokens, excluding prompt template / special tokens).
+# The API budgets match the ~500 characters of content the prompts always carried
+TOKEN_BUDGETS = {
+    'roberta': int(os.getenv('ROBERTA_MAX_TOKENS', 512)),
+    'roberta_title': int(os.getenv('ROBERTA_TITLE_TOKENS', 48)),
+    'openai': int(os.getenv('OPENAI_CONTENT_TOKENS', 125)),
+    'groq': int(os.getenv('GROQ_CONTENT_TOKENS', 125))
+}
+
+# Optional sliding-window inference for long articles in the RoBERTa voter
+ROBERTA_WINDOWING = os.getenv('ROBERTA_WINDOWING', 'false').lower() == 'true'
+ROBERTA_MAX_WINDOWS = int(os.getenv('ROBERTA_MAX_WINDOWS', 4))
+ROBERTA_WINDOW_OVERLAP = int(os.getenv('ROBERTA_WINDOW_OVERLAP', 64))
+ROBERTA_POOLING = os.getenv('ROBERTA_POOLING', 'mean')  # mean, max or attention
+
+# Rough characters-per-token ratio for English text on GPT-style tokenizers
+CHARS_PER_TOKEN = 4
+
+# Cache of tokenizer encodings for repeated headlines/articles, bounded by the total
+# number of cached tokens (~12 bytes each as packed ids plus offsets)
+TOKENIZER_CACHE_TOKENS = int(os.getenv('TOKENIZER_CACHE_TOKENS', 1_000_000))
+
+# CPU inference threading: a small dedicated pool runs forward passes with a fixed
+# number of torch intra-op threads, optionally pinned to its own cores (e.g. "4-7")
+INFERENCE_WORKERS = int(os.getenv('INFERENCE_WORKERS', 1))
+INFERENCE_CPUS = os.getenv('INFERENCE_CPUS', '')
+TORCH_INTRA_OP_THREADS = int(os.getenv('TORCH_INTRA_OP_THREADS', 0))  # 0 = one per inference core
+TORCH_INTER_OP_THREADS = int(os.getenv('TORCH_INTER_OP_THREADS', 1))
+
+# Voter selection: 'all' runs every available voter, 'budget' fits a latency/cost budget.
+# A budget sent with a request always applies the budget policy to that request
+VOTER_POLICY = os.getenv('VOTER_POLICY', 'all')
+VOTER_BUDGET_MS = float(os.getenv('VOTER_BUDGET_MS')) if os.getenv('VOTER_BUDGET_MS') else None
+VOTER_BUDGET_USD = float(os.getenv('VOTER_BUDGET_USD')) if os.getenv('VOTER_BUDGET_USD') else None
+VOTER_PRICES = {
+    'openai': float(os.getenv('OPENAI_PRICE_PER_1K_TOKENS', 0.002)),
+    'groq': float(os.getenv('GROQ_PRICE_PER_1K_TOKENS', 0.0006)),
+    'search': float(os.getenv('SERPER_PRICE_PER_QUERY', 0.001))
+}
+
+# Admission control for full-ensemble runs: interactive requests are served before
+# batch/RSS work; on overload a class is degraded to the quick path or shed
+ADMISSION_CAPACITY = int(os.getenv('ADMISSION_CAPACITY', 8))
+PRIORITY_CLASSES = [
+    PriorityClass(
+        'interactive',
+        max_queue=int(os.getenv('INTERACTIVE_MAX_QUEUE', 32)),
+        queue_timeout_ms=int(os.getenv('INTERACTIVE_QUEUE_TIMEOUT_MS', 5000)),
+        on_overload=os.getenv('INTERACTIVE_OVERLOAD_ACTION', 'degraded')
+    ),
+    PriorityClass(
+        'batch',
+        max_queue=int(os.getenv('BATCH_MAX_QUEUE', 8)),
+        queue_timeout_ms=int(os.getenv('BATCH_QUEUE_TIMEOUT_MS', 1000)),
+        max_concurrent=int(os.getenv('BATCH_MAX_CONCURRENT', 4)),
+        on_overload=os.getenv('BATCH_OVERLOAD_ACTION', 'degraded')
+    )
+]
+
+# Collapse concurrent identical /analyze requests onto one ensemble run
+SINGLE_FLIGHT = os.getenv('SINGLE_FLIGHT', 'true').lower() == 'true'
+
+# Provider endpoints (overridable to point at local stand-in servers for load tests)
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1').rstrip('/')
+GROQ_BASE_URL = os.getenv('GROQ_BASE_URL', 'https://api.groq.com/openai/v1').rstrip('/')
+SERPER_BASE_URL = os.getenv('SERPER_BASE_URL', 'https://google.serper.dev').rstrip('/')
+
+# Record/replay of provider responses: off, record or replay
+PROVIDER_CASSETTE_MODE = os.getenv('PROVIDER_CASSETTE_MODE', 'off').lower()
+PROVIDER_CASSETTE_DIR = os.getenv('PROVIDER_CASSETTE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recordings'))
+PROVIDER_REPLAY_LATENCY = os.getenv('PROVIDER_REPLAY_LATENCY', 'original')  # original, zero or a scale factor
+
+# Skip local model loading for API-only deployments and load tests
+LOAD_LOCAL_MODELS = os.getenv('LOAD_LOCAL_MODELS', 'true').lower() == 'true'
+SERVICE_PORT = int(os.getenv('PYTHON_SERVICE_PORT', 5001))
+
+# Execution backend for CPU-heavy local voters: 'thread' (in the request thread)
+# or 'process' (long-lived worker processes, outside the GIL)
+INFERENCE_BACKEND = os.getenv('INFERENCE_BACKEND', 'thread').lower()
+PROCESS_WORKERS = int(os.getenv('PROCESS_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+PROCESS_WORKER_THREADS = int(os.getenv('PROCESS_WORKER_THREADS', 1))
+PROCESS_VOTERS = [v.strip() for v in os.getenv('PROCESS_VOTERS', 'roberta,llama').split(',') if v.strip()]
+
+# Warmup and optional compiled execution for local models
+MODEL_WARMUP = os.getenv('MODEL_WARMUP', 'true').lower() == 'true'
+WARMUP_SEQ_LENGTHS = [int(n) for n in os.getenv('WARMUP_SEQ_LENGTHS', '64,256,512').split(',') if n.strip()]
+MODEL_COMPILE = os.getenv('MODEL_COMPILE', 'none').lower()  # none, compile or torchscript
+
+# Optional zero-shot (BART-MNLI) and sentiment voters, micro-batched across requests.
+# Each is off unless enabled and waits at most its own latency budget.
+ZERO_SHOT_VOTER = os.getenv('ZERO_SHOT_VOTER', 'false').lower() == 'true'
+SENTIMENT_VOTER = os.getenv('SENTIMENT_VOTER', 'false').lower() == 'true'
+ZERO_SHOT_BUDGET_MS = float(os.getenv('ZERO_SHOT_BUDGET_MS', 1000))
+SENTIMENT_BUDGET_MS = float(os.getenv('SENTIMENT_BUDGET_MS', 300))
+PIPELINE_BATCH_SIZE = int(os.getenv('PIPELINE_BATCH_SIZE', 8))
+PIPELINE_MAX_WAIT_MS = float(os.getenv('PIPELINE_MAX_WAIT_MS', 10))
+ZERO_SHOT_LABELS = {'reliable news': 'Real', 'misinformation': 'Fake'}
+ZERO_SHOT_TEMPLATE = os.getenv('ZERO_SHOT_TEMPLATE', 'This text is {}.')
+ZERO_SHOT_MAX_TOKENS = int(os.getenv('ZERO_SHOT_MAX_TOKENS', 256))
+# Strongly emotional tone (positive or negative) counts as a weak misinformation signal
+SENTIMENT_EMOTIONAL_THRESHOLD = float(os.getenv('SENTIMENT_EMOTIONAL_THRESHOLD', 0.85))
+
+# Local model registry: models beyond the memory budget load on demand and the
+# least-recently-used ones are unloaded (0 = no budget). Pipelines are only
+# preloaded when their voter is enabled.
+MODEL_MEMORY_BUDGET_MB = int(os.getenv('MODEL_MEMORY_BUDGET_MB', 0))
+MODEL_USE_SAFETENSORS = os.getenv('MODEL_USE_SAFETENSORS', 'true').lower() == 'true'
+DEFAULT_PRELOAD = ['roberta'] + (['bart-mnli'] if ZERO_SHOT_VOTER else []) + (['sentiment'] if SENTIMENT_VOTER else [])
+MODEL_PRELOAD = [m.strip() for m in os.getenv('MODEL_PRELOAD', ','.join(DEFAULT_PRELOAD)).split(',') if m.strip()]
+LOCAL_PIPELINES = [
+    ('bart-mnli', "facebook/bart-large-mnli", "zero-shot-classification"),
+    ('sentiment', "cardiffnlp/twitter-roberta-base-sentiment-latest", "sentiment-analysis")
+]
+MODEL_LABELS = {'roberta': 'RoBERTa', 'bart-mnli': 'BART-MNLI', 'sentiment': 'Sentiment'}
+# fp32 weight sizes, used to plan loads before a model's real size is known
+MODEL_SIZE_ESTIMATES_MB = {'roberta': 480, 'bart-mnli': 1560, 'sentiment': 480}
+
+# Persistent URL-keyed verdict store (SQLite) with a Bloom-filter precheck
+VERDICT_STORE = os.getenv('VERDICT_STORE', 'true').lower() == 'true'
+VERDICT_STORE_PATH = os.getenv('VERDICT_STORE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'verdicts.sqlite3'))
+VERDICT_TTL_HOURS = float(os.getenv('VERDICT_TTL_HOURS', 24))
+VERDICT_BLOOM_CAPACITY = int(os.getenv('VERDICT_BLOOM_CAPACITY', 100000))
+VERDICT_BLOOM_ERROR_RATE = float(os.getenv('VERDICT_BLOOM_ERROR_RATE', 0.01))
+# Expired verdicts are purged and the Bloom filter rebuilt this often (and whenever it passes capacity)
+VERDICT_MAINTENANCE_MINUTES = float(os.getenv('VERDICT_MAINTENANCE_MINUTES', 60))
+
+# Cache shared across replicas: 'memory' (this process only) or 'redis' (any Redis-protocol server)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory').lower()
+CACHE_URL = os.getenv('CACHE_URL', 'redis://127.0.0.1:6379/0')
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 10000))
+CACHE_REPLICA_ID = os.getenv('CACHE_REPLICA_ID')  # defaults to hostname:pid
+CACHE_TTLS = {
+    'verdict': int(os.getenv('CACHE_TTL_VERDICT', 6 * 3600)),
+    'search': int(os.getenv('CACHE_TTL_SEARCH', 3600))
+}
+
+
+def parse_cpu_list(spec):
+    """Parse a CPU list like "0-3,6" into a set of core ids"""
+    cpus = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            cpus.update(range(int(start), int(end) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+
+class EncodingCache:
+    """Thread-safe LRU cache of tokenizer encodings keyed on a text hash, bounded by total tokens"""
+
+    def __init__(self, max_tokens):
+        self.max_tokens = max_tokens
+        self._entries = OrderedDict()  # key -> (encoding, token count)
+        self._lock = threading.Lock()
+        self.tokens = 0
+        self.hits = 0
+        self.misses = 0
+        self.encode_calls = 0
+        self.encode_ms = 0.0
+
+    @staticmethod
+    def key(namespace, text):
+        return f"{namespace}:{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = len(value['input_ids'])
+        if size > self.max_tokens:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.tokens -= previous[1]
+            self._entries[key] = (value, size)
+            self.tokens += size
+            while self.tokens > self.max_tokens:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.tokens -= evicted
+
+    def record_encode(self, elapsed_ms):
+        with self._lock:
+            self.encode_calls += 1
+            self.encode_ms += elapsed_ms
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'tokens': self.tokens,
+                'max_tokens': self.max_tokens,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'encode_calls': self.encode_calls,
+                'encode_ms_total': round(self.encode_ms, 1),
+                'encode_ms_avg': round(self.encode_ms / self.encode_calls, 2) if self.encode_calls else 0.0
+            }
+
+
+class RequestStats:
+    """In-flight HTTP request accounting, used to report worker saturation"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+
+    def start(self):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finish(self):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def snapshot(self, reset_peak=False):
+        with self._lock:
+            snapshot = {
+                'in_flight': self.in_flight,
+                'peak_in_flight': self.peak_in_flight,
+                'completed': self.completed
+            }
+            if reset_peak:
+                self.peak_in_flight = self.in_flight
+            return snapshot
+
+
+request_stats = RequestStats()
+
+
+def normalize_content_key(title, content):
+    """Key identical articles regardless of case and whitespace differences"""
+    normalized = ' '.join(f"{title}\n{content}".lower().split())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key onto one in-flight computation"""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+            self.waiters = 0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """Run fn() once per key at a time; returns (result, was_coalesced)"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._Call()
+                self._calls[key] = call
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Followers get their own copy so callers can't mutate a shared result
+            return copy.deepcopy(call.result), True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            total = self.executions + self.coalesced
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+                'coalesced_ratio': round(self.coalesced / total, 3) if total else 0.0
+            }
+
+
 class EnhancedMultiAPIEnsemble:
     def __init__(self):
-        self.models = {}
-        self.loaded_models = []
+        self.models = ModelRegistry(MODEL_MEMORY_BUDGET_MB)
         self.failed_models = []
         self.api_keys = self._load_api_keys()
         self.executor = ThreadPoolExecutor(max_workers=6)
+        self.encoding_cache = EncodingCache(TOKENIZER_CACHE_TOKENS)
+        self.inference_executor = None
+        self.inference_config = {}
+        self.warmup_stats = {}
+        self.single_flight = SingleFlight()
+        self.voter_stats = VoterStats()
+        self.voter_policy = create_policy(VOTER_POLICY, self.voter_stats)
+        self.request_budget_policy = BudgetVoterPolicy(self.voter_stats)
+        self.admission = AdmissionController(ADMISSION_CAPACITY, PRIORITY_CLASSES)
+        self.process_pool = None
+        self.cassettes = CassetteStore(PROVIDER_CASSETTE_DIR, PROVIDER_CASSETTE_MODE, PROVIDER_REPLAY_LATENCY)
+        self.verdicts = VerdictStore(
+            VERDICT_STORE_PATH, VERDICT_TTL_HOURS * 3600, VERDICT_BLOOM_CAPACITY, VERDICT_BLOOM_ERROR_RATE,
+            VERDICT_MAINTENANCE_MINUTES * 60
+        ) if VERDICT_STORE else None
+        self.cache = create_cache(CACHE_BACKEND, CACHE_URL, CACHE_MAX_ENTRIES, CACHE_REPLICA_ID, CACHE_TTLS)
+        self.hypothesis_cache = {}
+        self.special_token_layouts = {}
+        self.pipeline_batchers = self._create_pipeline_batchers()
+        self.ready = True  # False only while local models load and warm up
+
+    @property
+    def loaded_models(self):
+        """Local models currently resident (the registry loads and unloads them on demand)"""
+        return [f"{MODEL_LABELS.get(name, name)}-Local" for name in self.models.keys() if self.models.is_loaded(name)]
 
     def _load_api_keys(self):
         """Load all API keys from environment with debugging"""
@@ -67,50 +418,41 @@ class EnhancedMultiAPIEnsemble:
     def load_local_models(self):
         """Load local Hugging Face models"""
         global device
+        self.ready = False
         try:
-            from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
             import torch
-            
+
             device = 'cuda' if torch.cuda.is_available() else 'cpu'
             logger.info(f"🔧 Using device: {device}")
-
-            # Load RoBERTa Fake News Model (Keep this as primary)
-            try:
-                logger.info("🤖 Loading RoBERTa Fake News Model...")
-                self.models['roberta'] = {
-                    'tokenizer': AutoTokenizer.from_pretrained("hamzab/roberta-fake-news-classification"),
-                    'model': AutoModelForSequenceClassification.from_pretrained("hamzab/roberta-fake-news-classification"),
-                    'type': 'classification'
-                }
-                self.models['roberta']['model'].to(device)
-                self.models['roberta']['model'].eval()
-                self.loaded_models.append('RoBERTa-Local')
-                logger.info("✅ RoBERTa model loaded successfully")
-            except Exception as e:
-                logger.error(f"❌ Failed to load RoBERTa: {e}")
-                self.failed_models.append(f'RoBERTa: {str(e)[:100]}')
-
-            # Load other local models with better error handling
-            local_models = [
-                ("BART-MNLI", "facebook/bart-large-mnli", "zero-shot-classification"),
-                ("Sentiment", "cardiffnlp/twitter-roberta-base-sentiment-latest", "sentiment-analysis")
-            ]
-
-            for name, model_name, task in local_models:
+            self.configure_inference_threads()
+
+            # Register loaders; the registry loads on demand and unloads LRU models over the budget
+            self.models.register('roberta', self._load_roberta, MODEL_SIZE_ESTIMATES_MB.get('roberta'))
+            for name, model_name, task in LOCAL_PIPELINES:
+                self.models.register(
+                    name, lambda model_name=model_name, task=task: self._load_pipeline(model_name, task),
+                    MODEL_SIZE_ESTIMATES_MB.get(name)
+                )
+
+            for name in MODEL_PRELOAD:
+                if name not in self.models:
+                    continue
+                label = MODEL_LABELS.get(name, name)
+                budget = self.models.budget_mb
+                if budget and self.models.resident_mb() + (MODEL_SIZE_ESTIMATES_MB.get(name) or 0) > budget:
+                    logger.info(f"📦 {label} deferred: would exceed the {budget}MB model budget, loading on demand")
+                    continue
                 try:
-                    logger.info(f"🤖 Loading {name} Model...")
-                    self.models[name.lower()] = pipeline(
-                        task,
-                        model=model_name,
-                        device=0 if device == 'cuda' else -1,
-                        truncation=True,
-                        max_length=512
-                    )
-                    self.loaded_models.append(f'{name}-Local')
-                    logger.info(f"✅ {name} model loaded successfully")
+                    logger.info(f"🤖 Loading {label} Model...")
+                    self.models.acquire(name)
+                    logger.info(f"✅ {label} model loaded successfully")
                 except Exception as e:
-                    logger.error(f"❌ Failed to load {name}: {e}")
-                    self.failed_models.append(f'{name}: {str(e)[:100]}')
+                    logger.error(f"❌ Failed to load {label}: {e}")
+                    self.failed_models.append(f'{label}: {str(e)[:100]}')
+                    self.models.unregister(name)
+
+            if MODEL_WARMUP:
+                self.warmup_models()
 
             return True
 
@@ -118,6 +460,388 @@ class EnhancedMultiAPIEnsemble:
             logger.error(f"❌ Critical error loading local models: {e}")
             return False
 
+        finally:
+            self.ready = True
+
+    def _from_pretrained(self, loader, model_name, **kwargs):
+        """Load weights from safetensors (memory-mapped, no pickle copy) when the repo ships them"""
+        if MODEL_USE_SAFETENSORS:
+            from transformers.utils import is_accelerate_available
+
+            # low_cpu_mem_usage skips the random-init copy but needs accelerate
+            mmap_kwargs = {'use_safetensors': True}
+            if is_accelerate_available():
+                mmap_kwargs['low_cpu_mem_usage'] = True
+            try:
+                return loader(model_name, **mmap_kwargs, **kwargs)
+            except OSError as e:
+                logger.info(f"📦 No safetensors weights for {model_name}, using the default format: {str(e)[:80]}")
+        return loader(model_name, **kwargs)
+
+    def _load_roberta(self):
+        """Loader for the RoBERTa fake-news classifier (registry callback)"""
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        model_name = "hamzab/roberta-fake-news-classification"
+        model_data = {
+            'tokenizer': AutoTokenizer.from_pretrained(model_name),
+            'model': self._from_pretrained(AutoModelForSequenceClassification.from_pretrained, model_name),
+            'type': 'classification'
+        }
+        model_data['model'].to(device)
+        model_data['model'].eval()
+        self.compile_models(model_data)
+        return model_data
+
+    def _load_pipeline(self, model_name, task):
+        """Loader for a transformers pipeline model (registry callback)"""
+        from transformers import pipeline
+
+        def load(name, **model_kwargs):
+            return pipeline(
+                task,
+                model=name,
+                device=0 if device == 'cuda' else -1,
+                truncation=True,
+                max_length=512,
+                model_kwargs=model_kwargs
+            )
+        return self._from_pretrained(load, model_name)
+
+    def compile_models(self, model_data):
+        """Optionally swap RoBERTa for a torch.compile'd or TorchScript-traced module"""
+        if MODEL_COMPILE == 'none':
+            return
+        import torch
+
+        eager_model = model_data['model']
+        try:
+            logger.info(f"⚙️ Compiling RoBERTa ({MODEL_COMPILE})...")
+            if MODEL_COMPILE == 'compile':
+                compiled = torch.compile(eager_model, dynamic=True)
+            elif MODEL_COMPILE == 'torchscript':
+                example = model_data['tokenizer'](
+                    ['warmup'], return_tensors='pt', padding='max_length', max_length=128
+                )
+                example = {k: v.to(device) for k, v in example.items()}
+                with torch.no_grad():
+                    compiled = torch.jit.trace(
+                        eager_model, (example['input_ids'], example['attention_mask']), strict=False
+                    )
+            else:
+                logger.warning(f"⚠️ Unknown MODEL_COMPILE mode '{MODEL_COMPILE}', using eager")
+                return
+            model_data['eager_model'] = eager_model
+            model_data['model'] = compiled
+            model_data['execution_mode'] = MODEL_COMPILE
+        except Exception as e:
+            logger.warning(f"⚠️ RoBERTa {MODEL_COMPILE} failed, using eager mode: {e}")
+            model_data['execution_mode'] = 'eager'
+
+    def _fallback_to_eager(self, error):
+        """Restore the eager RoBERTa module after a compiled-path failure"""
+        model_data = self.models['roberta']
+        if 'eager_model' not in model_data:
+            # Another request may already have fallen back
+            return model_data.get('execution_mode') == 'eager'
+        logger.warning(f"⚠️ Compiled RoBERTa failed, falling back to eager mode: {error}")
+        model_data['model'] = model_data.pop('eager_model')
+        model_data['execution_mode'] = 'eager'
+        return True
+
+    def warmup_models(self):
+        """Run representative dummy batches through each local model before serving"""
+        started = time.perf_counter()
+        stats = {}
+
+        # Only warm what is resident; warming a deferred model would load it past the budget
+        if self.models.is_loaded('roberta'):
+            tokenizer = self.models['roberta']['tokenizer']
+            batch_sizes = sorted({1, ROBERTA_MAX_WINDOWS if ROBERTA_WINDOWING else 1})
+            for seq_len in WARMUP_SEQ_LENGTHS:
+                for batch_size in batch_sizes:
+                    inputs = tokenizer(
+                        ['warmup ' * seq_len] * batch_size,
+                        return_tensors='pt', padding='max_length', truncation=True, max_length=seq_len
+                    )
+                    step_start = time.perf_counter()
+                    try:
+                        # Touch every inference worker so each one initializes its own threads
+                        workers = self.inference_config.get('workers', 1)
+                        if self.inference_executor:
+                            futures = [self.inference_executor.submit(self._roberta_forward, inputs) for _ in range(workers)]
+                            for future in futures:
+                                future.result()
+                        else:
+                            self._roberta_forward(inputs)
+                    except Exception as e:
+                        logger.warning(f"⚠️ RoBERTa warmup failed at seq_len={seq_len}, batch={batch_size}: {e}")
+                        continue
+                    stats[f'roberta_seq{seq_len}_batch{batch_size}_ms'] = round((time.perf_counter() - step_start) * 1000, 1)
+
+        dummy_text = "Officials confirmed the report in a statement on Monday. " * 8
+        if self.models.is_loaded('bart-mnli'):
+            step_start = time.perf_counter()
+            try:
+                # Runs the batched voter path, which also caches the hypothesis encodings
+                list(self._run_zero_shot_batch([dummy_text]))
+                stats['bart_mnli_ms'] = round((time.perf_counter() - step_start) * 1000, 1)
+            except Exception as e:
+                logger.warning(f"⚠️ BART-MNLI warmup failed: {e}")
+        if self.models.is_loaded('sentiment'):
+            step_start = time.perf_counter()
+            try:
+                self.models['sentiment'](dummy_text)
+                stats['sentiment_ms'] = round((time.perf_counter() - step_start) * 1000, 1)
+            except Exception as e:
+                logger.warning(f"⚠️ Sentiment warmup failed: {e}")
+
+        stats['total_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        self.warmup_stats = stats
+        logger.info(f"🔥 Warmup complete in {stats['total_ms']}ms")
+        return stats
+
+    def configure_inference_threads(self, workers=None, intra_op_threads=None, cpus=None):
+        """Create the dedicated inference pool and set torch threading for CPU inference"""
+        import torch
+
+        workers = workers or INFERENCE_WORKERS
+        cpus = parse_cpu_list(INFERENCE_CPUS if cpus is None else cpus)
+        available = os.sched_getaffinity(0) if hasattr(os, 'sched_getaffinity') else set(range(os.cpu_count() or 1))
+        cpus = (cpus & available) or available
+        intra_op_threads = intra_op_threads or TORCH_INTRA_OP_THREADS or max(1, len(cpus) // workers)
+
+        # Inter-op threads can only be set once, before any parallel work runs
+        try:
+            torch.set_num_interop_threads(TORCH_INTER_OP_THREADS)
+        except RuntimeError:
+            pass
+        torch.set_num_threads(intra_op_threads)
+
+        def init_worker():
+            if hasattr(os, 'sched_setaffinity'):
+                os.sched_setaffinity(0, cpus)  # pid 0 = this thread on Linux
+            torch.set_num_threads(intra_op_threads)
+
+        if self.inference_executor:
+            self.inference_executor.shutdown(wait=True)
+        self.inference_executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix='inference',
+            initializer=init_worker
+        )
+        self.inference_config = {
+            'workers': workers,
+            'intra_op_threads': intra_op_threads,
+            'inter_op_threads': torch.get_num_interop_threads(),
+            'cpus': sorted(cpus)
+        }
+        logger.info(f"🧵 Inference pool: {workers} worker(s) x {intra_op_threads} intra-op thread(s) on CPUs {sorted(cpus)}")
+        return self.inference_config
+
+    def pin_http_threads(self):
+        """Pin the calling (main) thread, and so the HTTP threads it spawns, off the inference cores"""
+        if not INFERENCE_CPUS or not hasattr(os, 'sched_setaffinity'):
+            return None
+        http_cpus = os.sched_getaffinity(0) - parse_cpu_list(INFERENCE_CPUS)
+        if http_cpus:
+            os.sched_setaffinity(0, http_cpus)
+            logger.info(f"🧵 HTTP threads pinned to CPUs {sorted(http_cpus)}")
+        return http_cpus
+
+    def run_inference(self, fn, *args):
+        """Run a forward pass on the dedicated inference pool"""
+        if self.inference_executor is None:
+            return fn(*args)
+        return self.inference_executor.submit(fn, *args).result()
+
+    def start_process_pool(self, workers=None, threads_per_worker=None):
+        """Start worker processes for CPU-heavy voters (after models are loaded, so forks share weights)"""
+        if self.process_pool:
+            self.process_pool.shutdown()
+        self.process_pool = InferenceProcessPool(
+            self,
+            workers or PROCESS_WORKERS,
+            threads_per_worker or PROCESS_WORKER_THREADS,
+            PROCESS_VOTERS
+        )
+        return self.process_pool
+
+    def reset_for_worker_process(self, threads):
+        """Drop parent-process threads and locks inherited by a pool worker"""
+        self.inference_executor = None
+        self.process_pool = None
+        self.encoding_cache = EncodingCache(TOKENIZER_CACHE_TOKENS)
+        self.pipeline_batchers = self._create_pipeline_batchers()
+        self.models.reset_locks()
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+
+    def run_local_voter(self, voter, title, content):
+        """Run a local voter in this process (used inside pool workers)"""
+        local_voters = {
+            'roberta': self.predict_roberta_local,
+            'llama': self.predict_llama_enhanced_fallback_only
+        }
+        return local_voters[voter](title, content)
+
+    def _create_pipeline_batchers(self):
+        batchers = {}
+        if ZERO_SHOT_VOTER:
+            batchers['zeroshot'] = MicroBatcher('zeroshot', self._run_zero_shot_batch, PIPELINE_BATCH_SIZE, PIPELINE_MAX_WAIT_MS)
+        if SENTIMENT_VOTER:
+            batchers['sentiment'] = MicroBatcher('sentiment', self._run_sentiment_batch, PIPELINE_BATCH_SIZE, PIPELINE_MAX_WAIT_MS)
+        return batchers
+
+    def _pipeline_input(self, title, content):
+        text = f"{title}. {content}" if title else content
+        return self.truncate_text(text, ZERO_SHOT_MAX_TOKENS * CHARS_PER_TOKEN)
+
+    def submit_pipeline_voter(self, voter, title, content):
+        """Queue a batched pipeline voter; returns a future for its raw output"""
+        text = self._pipeline_input(title, content)
+        key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        return self.pipeline_batchers[voter].submit(key, text)
+
+    def prefetch_pipeline_voters(self, articles):
+        """Queue (title, content) pairs for every enabled pipeline voter in one go"""
+        articles = list(articles)
+        for batcher in self.pipeline_batchers.values():
+            texts = [self._pipeline_input(title, content) for title, content in articles]
+            batcher.map((hashlib.sha1(text.encode('utf-8')).hexdigest(), text) for text in texts)
+
+    def collect_pipeline_voter(self, voter, future):
+        """Wait for a pipeline voter within its latency budget and map its output to a prediction"""
+        model, budget_ms = {
+            'zeroshot': ('BART-MNLI-ZeroShot', ZERO_SHOT_BUDGET_MS),
+            'sentiment': ('Sentiment-Tone', SENTIMENT_BUDGET_MS)
+        }[voter]
+        try:
+            output = future.result(timeout=budget_ms / 1000)
+        except FuturesTimeout:
+            future.cancel()
+            return {'model': model, 'error': f'Exceeded {budget_ms:.0f}ms latency budget'}
+        except Exception as e:
+            return {'model': model, 'error': str(e)}
+
+        if voter == 'zeroshot':
+            best = max(output, key=output.get)
+            label = ZERO_SHOT_LABELS[best]
+            confidence = output[best] * 100
+            reasoning = f"Zero-shot NLI: '{best}' entailed with {confidence:.1f}% probability"
+        else:
+            tone, score = output['label'].lower(), output['score']
+            emotional = tone != 'neutral' and score >= SENTIMENT_EMOTIONAL_THRESHOLD
+            label = 'Fake' if emotional else 'Real'
+            # A weak voter: tone alone never carries high confidence
+            confidence = min(70.0, 50 + score * 20)
+            reasoning = f"Sentiment tone: {tone} ({score:.2f}){', strongly emotional framing' if emotional else ''}"
+        return {
+            'model': model,
+            'label': label,
+            'confidence': round(confidence, 1),
+            'reasoning': reasoning
+        }
+
+    def predict_zero_shot(self, title, content):
+        """Batched BART-MNLI zero-shot prediction"""
+        if 'zeroshot' not in self.pipeline_batchers:
+            return {'model': 'BART-MNLI-ZeroShot', 'error': 'Zero-shot voter disabled'}
+        return self.collect_pipeline_voter('zeroshot', self.submit_pipeline_voter('zeroshot', title, content))
+
+    def predict_sentiment(self, title, content):
+        """Batched sentiment-tone prediction"""
+        if 'sentiment' not in self.pipeline_batchers:
+            return {'model': 'Sentiment-Tone', 'error': 'Sentiment voter disabled'}
+        return self.collect_pipeline_voter('sentiment', self.submit_pipeline_voter('sentiment', title, content))
+
+    def _hypothesis_encodings(self, tokenizer):
+        """Token ids of each candidate-label hypothesis, computed once per tokenizer"""
+        key = (id(tokenizer), ZERO_SHOT_TEMPLATE, tuple(ZERO_SHOT_LABELS))
+        if key not in self.hypothesis_cache:
+            self.hypothesis_cache.clear()  # a reloaded model brings a new tokenizer
+            self.hypothesis_cache[key] = [
+                (label, tokenizer(ZERO_SHOT_TEMPLATE.format(label), add_special_tokens=False)['input_ids'])
+                for label in ZERO_SHOT_LABELS
+            ]
+        return self.hypothesis_cache[key]
+
+    def _run_zero_shot_batch(self, texts):
+        """NLI over (premise, cached hypothesis) pairs in batch_size chunks; yields per-text label probabilities"""
+        import torch
+
+        # Leased for the whole batch so a concurrent load can't evict the model mid-inference
+        with self.models.lease('bart-mnli') as pipe:
+            tokenizer, model = pipe.tokenizer, pipe.model
+            label2id = {k.lower(): v for k, v in model.config.label2id.items()}
+            entailment = label2id.get('entailment', len(label2id) - 1)
+            hypotheses = self._hypothesis_encodings(tokenizer)
+            max_length = min(ZERO_SHOT_MAX_TOKENS, tokenizer.model_max_length)
+            special = tokenizer.num_special_tokens_to_add(pair=True)
+
+            pairs = []
+            for premise in tokenizer(texts, add_special_tokens=False)['input_ids']:
+                for _, hypothesis in hypotheses:
+                    room = max(1, max_length - len(hypothesis) - special)
+                    pairs.append(self.add_special_tokens(tokenizer, premise[:room], hypothesis))
+
+            logits, emitted = [], 0
+            for start in range(0, len(pairs), PIPELINE_BATCH_SIZE):
+                batch = tokenizer.pad({'input_ids': pairs[start:start + PIPELINE_BATCH_SIZE]}, return_tensors='pt')
+                logits.extend(self.run_inference(self._zero_shot_forward, model, batch, entailment))
+                # Stream out every text whose hypotheses are all scored
+                while (emitted + 1) * len(hypotheses) <= len(logits):
+                    scores = torch.tensor(logits[emitted * len(hypotheses):(emitted + 1) * len(hypotheses)]).softmax(dim=0)
+                    yield {label: score for (label, _), score in zip(hypotheses, scores.tolist())}
+                    emitted += 1
+
+    def _zero_shot_forward(self, model, batch, entailment):
+        """NLI forward pass returning the entailment logit of each pair"""
+        import torch
+
+        batch = {k: v.to(device) for k, v in batch.items()}
+        with torch.no_grad():
+            return model(**batch).logits[:, entailment].tolist()
+
+    def _sentiment_forward(self, pipe, texts):
+        """Sentiment pipeline over one chunk of texts"""
+        return pipe(texts, batch_size=PIPELINE_BATCH_SIZE)
+
+    def _run_sentiment_batch(self, texts):
+        """Sentiment pipeline over the batch in batch_size chunks; outputs stream back chunk by chunk"""
+        with self.models.lease('sentiment') as pipe:
+            for start in range(0, len(texts), PIPELINE_BATCH_SIZE):
+                for output in self.run_inference(self._sentiment_forward, pipe, texts[start:start + PIPELINE_BATCH_SIZE]):
+                    yield output[0] if isinstance(output, list) else output
+
+    def pipeline_voter_stats(self):
+        return {
+            'zeroshot': {
+                'enabled': ZERO_SHOT_VOTER,
+                'budget_ms': ZERO_SHOT_BUDGET_MS,
+                'labels': list(ZERO_SHOT_LABELS),
+                'hypotheses_cached': bool(self.hypothesis_cache),
+                'batcher': self.pipeline_batchers['zeroshot'].stats() if 'zeroshot' in self.pipeline_batchers else None
+            },
+            'sentiment': {
+                'enabled': SENTIMENT_VOTER,
+                'budget_ms': SENTIMENT_BUDGET_MS,
+                'batcher': self.pipeline_batchers['sentiment'].stats() if 'sentiment' in self.pipeline_batchers else None
+            }
+        }
+
+    def call_voter(self, voter, predict, title, content):
+        """Run a voter on the process pool when it handles it, otherwise in this thread"""
+        if self.process_pool and self.process_pool.handles(voter):
+            try:
+                return self.process_pool.run(voter, title, content)
+            except Exception as e:
+                logger.error(f"❌ Process pool failed for {voter}, running in-process: {e}")
+        return predict(title, content)
+
     def generate_analysis_based_summary(self, title, content, label, confidence, analysis_details=None):
         """Generate intelligent summaries based on actual analysis factors rather than copying content"""
         try:
@@ -377,118 +1101,101 @@ class EnhancedMultiAPIEnsemble:
                 'error': str(e)
             }
 
-    def comprehensive_ensemble_predict(self, title, content):
+    def voters(self):
+        """Ordered ensemble voters: (key, display name, predict function)"""
+        return [
+            ('llama', 'LLaMA Enhanced', self.predict_llama_enhanced_fallback_only),
+            ('openai', 'OpenAI', self.call_openai_api),
+            ('groq', 'Groq', self.call_groq_api),
+            ('search', 'Search', self.search_and_verify),
+            ('roberta', 'RoBERTa', self.predict_roberta_local),
+            ('zeroshot', 'Zero-Shot', self.predict_zero_shot),
+            ('sentiment', 'Sentiment', self.predict_sentiment)
+        ]
+
+    def available_voters(self):
+        """Voters whose API key or local model is present"""
+        available = {
+            'llama': True,
+            'openai': bool(self.api_keys.get('openai')),
+            'groq': bool(self.api_keys.get('groq')),
+            'search': bool(self.api_keys.get('serper')),
+            'roberta': 'roberta' in self.models,
+            'zeroshot': ZERO_SHOT_VOTER and 'bart-mnli' in self.models,
+            'sentiment': SENTIMENT_VOTER and 'sentiment' in self.models
+        }
+        return [key for key, _, _ in self.voters() if available.get(key)]
+
+    def estimate_voter_cost(self, voter, result):
+        """Estimate the USD cost of one voter call from its reported usage"""
+        if voter in ('openai', 'groq'):
+            usage = result.get('token_usage', {})
+            tokens = usage.get('total_tokens') or (usage.get('content_tokens', 0) + 300)
+            return tokens / 1000 * VOTER_PRICES[voter]
+        if voter == 'search':
+            return result.get('search_details', {}).get('queries_tried', 2) * VOTER_PRICES['search']
+        return 0.0
+
+    def comprehensive_ensemble_predict(self, title, content, budget_ms=None, budget_usd=None, url=None):
         """Main ensemble prediction method with intelligent summary generation"""
         try:
             logger.info(f"🚀 Starting comprehensive ensemble prediction...")
             predictions = []
-
-            # 1. Try Enhanced LLaMA Analysis (primary fallback)
-            try:
-                llama_result = self.predict_llama_enhanced_fallback_only(title, content)
-                if llama_result and not llama_result.get('error'):
-                    predictions.append(llama_result)
-                    logger.info(f"✅ LLaMA Enhanced: {llama_result['label']} ({llama_result['confidence']}%)")
-            except Exception as e:
-                logger.error(f"❌ LLaMA Enhanced failed: {e}")
-
-            # 2. Try OpenAI API
-            try:
-                openai_result = self.call_openai_api(title, content)
-                if openai_result and not openai_result.get('error'):
-                    predictions.append(openai_result)
-                    logger.info(f"✅ OpenAI: {openai_result['label']} ({openai_result['confidence']}%)")
-            except Exception as e:
-                logger.error(f"❌ OpenAI failed: {e}")
-
-            # 3. Try Groq API
-            try:
-                groq_result = self.call_groq_api(title, content)
-                if groq_result and not groq_result.get('error'):
-                    predictions.append(groq_result)
-                    logger.info(f"✅ Groq: {groq_result['label']} ({groq_result['confidence']}%)")
-            except Exception as e:
-                logger.error(f"❌ Groq failed: {e}")
-
-            # 4. Try Search Verification
-            try:
-                search_result = self.search_and_verify(title, content)
-                if search_result and not search_result.get('error'):
-                    predictions.append(search_result)
-                    logger.info(f"✅ Search: {search_result['label']} ({search_result['confidence']}%)")
-            except Exception as e:
-                logger.error(f"❌ Search verification failed: {e}")
-
-            # 5. Try Local RoBERTa (if available)
-            try:
-                roberta_result = self.predict_roberta_local(title, content)
-                if roberta_result and not roberta_result.get('error'):
-                    predictions.append(roberta_result)
-                    logger.info(f"✅ RoBERTa: {roberta_result['label']} ({roberta_result['confidence']}%)")
-            except Exception as e:
-                logger.error(f"❌ RoBERTa failed: {e}")
-
-            # Ensemble Decision Making
-            if not predictions:
-                logger.warning("⚠️ No predictions available, using fallback")
-                return {
-                    'label': 'Trustworthy',
-                    'confidence': 60,
-                    'summary': 'Analysis could not be completed due to service unavailability. Manual verification recommended.',
-                    'reasoning': 'Fallback response - no analysis services available',
-                    'ensemble_details': {
-                        'api_models_used': 0,
-                        'local_models_used': 0,
-                        'total_predictions': 0
-                    }
-                }
-
-            # Calculate ensemble results
-            real_votes = sum(1 for p in predictions if p['label'] in ['Real', 'Trustworthy'])
-            fake_votes = sum(1 for p in predictions if p['label'] in ['Fake', 'Untrustworthy'])
-            
-            # Determine final label
-            final_label = 'Trustworthy' if real_votes > fake_votes else 'Untrustworthy'
-            
-            # Calculate weighted confidence
-            total_confidence = sum(p['confidence'] for p in predictions)
-            avg_confidence = total_confidence / len(predictions)
-            
-            # Adjust confidence based on consensus
-            consensus_ratio = max(real_votes, fake_votes) / len(predictions)
-            adjusted_confidence = avg_confidence * (0.5 + consensus_ratio * 0.5)
-            final_confidence = round(min(90, max(50, adjusted_confidence)), 1)
-
-            # Generate intelligent ensemble summary using the method
-            ensemble_summary = self.generate_analysis_based_summary(
-                title, content, final_label, final_confidence
+            voted = []
+
+            # Pick which voters to run for this request's latency/cost budget; a budget sent
+            # with the request is honoured even when the configured policy ignores budgets
+            policy = self.voter_policy
+            if not policy.uses_budget and (budget_ms is not None or budget_usd is not None):
+                policy = self.request_budget_policy
+            plan = policy.plan(
+                self.available_voters(),
+                budget_ms if budget_ms is not None else VOTER_BUDGET_MS,
+                budget_usd if budget_usd is not None else VOTER_BUDGET_USD
             )
 
-            # Create detailed reasoning
-            api_models = [p['model'] for p in predictions if 'API' in p.get('model', '') or 'Groq' in p.get('model', '') or 'OpenAI' in p.get('model', '')]
-            local_models = [p['model'] for p in predictions if p.get('model', '') not in api_models]
-            
-            reasoning = f"Ensemble analysis: {real_votes} trustworthy votes, {fake_votes} untrustworthy votes. "
-            reasoning += f"Average confidence: {avg_confidence:.1f}%. "
-            reasoning += f"Consensus ratio: {consensus_ratio:.2f}. "
-            reasoning += f"Models used: {', '.join([p.get('model', 'Unknown') for p in predictions])}"
-
-            return {
-                'label': final_label,
-                'confidence': final_confidence,
-                'summary': ensemble_summary,  # This is now intelligent analysis-based
-                'reasoning': reasoning,
-                'real_probability': round((real_votes / len(predictions)) * 100, 1),
-                'fake_probability': round((fake_votes / len(predictions)) * 100, 1),
-                'ensemble_details': {
-                    'api_models_used': len(api_models),
-                    'local_models_used': len(local_models),
-                    'total_predictions': len(predictions),
-                    'predictions': predictions,
-                    'consensus_ratio': round(consensus_ratio, 3)
-                }
+            # Queue the batched pipeline voters first so they run alongside the API calls
+            pending = {
+                key: self.submit_pipeline_voter(key, title, content)
+                for key in plan['selected'] if key in self.pipeline_batchers
             }
 
+            for key, name, predict in self.voters():
+                if key not in plan['selected']:
+                    continue
+                started = time.perf_counter()
+                try:
+                    if key in pending:
+                        result = self.collect_pipeline_voter(key, pending[key])
+                    else:
+                        result = self.call_voter(key, predict, title, content)
+                    ok = bool(result) and not result.get('error')
+                    if ok:
+                        predictions.append(result)
+                        voted.append(key)
+                        logger.info(f"✅ {name}: {result['label']} ({result['confidence']}%)")
+                except Exception as e:
+                    ok = False
+                    logger.error(f"❌ {name} failed: {e}")
+                self.voter_stats.record_call(
+                    key,
+                    (time.perf_counter() - started) * 1000,
+                    self.estimate_voter_cost(key, result) if ok else 0.0,
+                    ok
+                )
+
+            ensemble_result = self.aggregate_predictions(title, content, predictions)
+
+            # Learn how often each voter agrees with the final verdict
+            final_real = ensemble_result['label'] in ['Real', 'Trustworthy']
+            for key, prediction in zip(voted, predictions):
+                self.voter_stats.record_agreement(key, (prediction['label'] in ['Real', 'Trustworthy']) == final_real)
+
+            ensemble_result['ensemble_details']['voter_plan'] = plan
+            if url and predictions:
+                self.record_verdict(url, ensemble_result)
+            return ensemble_result
+
         except Exception as e:
             logger.error(f"❌ Comprehensive ensemble error: {e}")
             return {
@@ -504,6 +1211,145 @@ class EnhancedMultiAPIEnsemble:
                 }
             }
 
+    def record_verdict(self, url, analysis):
+        """Index a full ensemble verdict by URL; failures never affect the analysis"""
+        if not self.verdicts:
+            return
+        try:
+            self.verdicts.put(url, analysis)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to store verdict for {url}: {e}")
+
+    def analyze_admitted(self, title, content, budget_ms=None, budget_usd=None, priority='interactive', url=None):
+        """Run the full ensemble if admitted, otherwise degrade to the quick path or shed"""
+        with self.admission.admit(priority) as decision:
+            if decision == ADMITTED:
+                return self.comprehensive_ensemble_predict(title, content, budget_ms, budget_usd, url), 'full'
+            if decision == DEGRADED:
+                logger.warning(f"⚠️ Overloaded, degrading {priority} request to quick analysis")
+                prediction = self.call_voter('llama', self.predict_llama_enhanced_fallback_only, title, content)
+                # Single-voter ensemble, so callers see the usual Trustworthy/Untrustworthy verdict shape
+                predictions = [prediction] if prediction and not prediction.get('error') else []
+                return self.aggregate_predictions(title, content, predictions), 'quick_degraded'
+            raise Overloaded(priority)
+
+    def verdict_cache_key(self, title, content, budget_ms=None, budget_usd=None):
+        return f"{normalize_content_key(title, content)}:{budget_ms}:{budget_usd}"
+
+    def cacheable_verdict(self, result, mode):
+        """Only full ensemble verdicts with at least one vote are shared across replicas"""
+        return mode == 'full' and result.get('ensemble_details', {}).get('total_predictions', 0) > 0
+
+    def analyze_coalesced(self, title, content, budget_ms=None, budget_usd=None, priority='interactive', url=None,
+                          use_cache=True):
+        """Run the ensemble, attaching to an identical in-flight analysis if there is one"""
+        key = self.verdict_cache_key(title, content, budget_ms, budget_usd)
+        if use_cache:
+            cached = self.cache.get('verdict', key)
+            if cached is not None:
+                if url:
+                    self.record_verdict(url, cached)
+                return cached, False, 'cached'
+
+        led = []
+
+        def run():
+            led.append(True)
+            return self.analyze_admitted(title, content, budget_ms, budget_usd, priority, url)
+
+        if not SINGLE_FLIGHT:
+            (result, mode), coalesced = run(), False
+        else:
+            # The leader's admission ran under its own priority class; a follower only reuses
+            # a full result and otherwise goes through admission for its own priority
+            try:
+                (result, mode), coalesced = self.single_flight.do(key, run)
+            except Overloaded:
+                if led:
+                    raise
+                (result, mode), coalesced = run(), False
+            if coalesced and mode != 'full':
+                (result, mode), coalesced = run(), False
+            if coalesced and url and mode == 'full':
+                # The leader indexed its own URL; the same content may live at this one too
+                self.record_verdict(url, result)
+        if use_cache and not coalesced and self.cacheable_verdict(result, mode):
+            self.cache.set('verdict', key, result)
+        return result, coalesced, mode
+
+    def aggregate_predictions(self, title, content, predictions):
+        """Combine voter predictions into the final ensemble verdict"""
+        if not predictions:
+            logger.warning("⚠️ No predictions available, using fallback")
+            return {
+                'label': 'Trustworthy',
+                'confidence': 60,
+                'summary': 'Analysis could not be completed due to service unavailability. Manual verification recommended.',
+                'reasoning': 'Fallback response - no analysis services available',
+                'ensemble_details': {
+                    'api_models_used': 0,
+                    'local_models_used': 0,
+                    'total_predictions': 0
+                }
+            }
+
+        # Calculate ensemble results
+        real_votes = sum(1 for p in predictions if p['label'] in ['Real', 'Trustworthy'])
+        fake_votes = sum(1 for p in predictions if p['label'] in ['Fake', 'Untrustworthy'])
+        
+        # Determine final label
+        final_label = 'Trustworthy' if real_votes > fake_votes else 'Untrustworthy'
+        
+        # Calculate weighted confidence
+        total_confidence = sum(p['confidence'] for p in predictions)
+        avg_confidence = total_confidence / len(predictions)
+        
+        # Adjust confidence based on consensus
+        consensus_ratio = max(real_votes, fake_votes) / len(predictions)
+        adjusted_confidence = avg_confidence * (0.5 + consensus_ratio * 0.5)
+        final_confidence = round(min(90, max(50, adjusted_confidence)), 1)
+
+        # Generate intelligent ensemble summary using the method
+        ensemble_summary = self.generate_analysis_based_summary(
+            title, content, final_label, final_confidence
+        )
+
+        # Create detailed reasoning
+        api_models = [p['model'] for p in predictions if 'API' in p.get('model', '') or 'Groq' in p.get('model', '') or 'OpenAI' in p.get('model', '')]
+        local_models = [p['model'] for p in predictions if p.get('model', '') not in api_models]
+        
+        reasoning = f"Ensemble analysis: {real_votes} trustworthy votes, {fake_votes} untrustworthy votes. "
+        reasoning += f"Average confidence: {avg_confidence:.1f}%. "
+        reasoning += f"Consensus ratio: {consensus_ratio:.2f}. "
+        reasoning += f"Models used: {', '.join([p.get('model', 'Unknown') for p in predictions])}"
+
+        # Per-request token usage across voters
+        token_usage = {p['model']: p['token_usage'] for p in predictions if p.get('token_usage')}
+        total_tokens = sum(
+            u.get('total_tokens') or u.get('input_tokens') or u.get('content_tokens') or 0
+            for u in token_usage.values()
+        )
+
+        return {
+            'label': final_label,
+            'confidence': final_confidence,
+            'summary': ensemble_summary,  # This is now intelligent analysis-based
+            'reasoning': reasoning,
+            'real_probability': round((real_votes / len(predictions)) * 100, 1),
+            'fake_probability': round((fake_votes / len(predictions)) * 100, 1),
+            'ensemble_details': {
+                'api_models_used': len(api_models),
+                'local_models_used': len(local_models),
+                'total_predictions': len(predictions),
+                'predictions': predictions,
+                'consensus_ratio': round(consensus_ratio, 3),
+                'token_usage': {
+                    'by_model': token_usage,
+                    'total_tokens': total_tokens
+                }
+            }
+        }
+
     def truncate_text(self, text, max_length=400):
         """Safely truncate text to prevent tensor size issues"""
         if len(text) > max_length:
@@ -515,6 +1361,214 @@ class EnhancedMultiAPIEnsemble:
             return truncated + "..."
         return text
 
+    def estimate_tokens(self, text):
+        """Cheap token estimate for API providers (no tokenizer round-trip)"""
+        if not text:
+            return 0
+        return max(len(text) // CHARS_PER_TOKEN, len(text.split()))
+
+    def _get_tokenizer(self, consumer):
+        """Return the loaded tokenizer for a consumer, or None for API providers"""
+        if consumer == 'roberta' and 'roberta' in self.models:
+            return self.models['roberta']['tokenizer']
+        return None
+
+    def _encode(self, text, consumer):
+        """Encode text (no special tokens) through the encoding cache"""
+        key = EncodingCache.key(f'{consumer}:raw', text)
+        encoded = self.encoding_cache.get(key)
+        if encoded is None:
+            encoded = self._encode_batch([text], consumer)[0]
+            self.encoding_cache.put(key, encoded)
+        return encoded
+
+    def _encode_batch(self, texts, consumer):
+        """Encode several texts in one call to the (fast, Rust) tokenizer"""
+        tokenizer = self._get_tokenizer(consumer)
+        start = time.perf_counter()
+        try:
+            batch = tokenizer(texts, add_special_tokens=False, return_offsets_mapping=True)
+            offsets = batch['offset_mapping']
+        except (NotImplementedError, TypeError):
+            # Slow tokenizers don't support offsets; callers cut on decoded ids instead
+            batch = tokenizer(texts, add_special_tokens=False)
+            offsets = [None] * len(texts)
+        self.encoding_cache.record_encode((time.perf_counter() - start) * 1000)
+        # Packed arrays: ids, and offsets flattened to [start0, end0, start1, end1, ...]
+        return [
+            {
+                'input_ids': array('i', ids),
+                'offset_mapping': None if offs is None else array('i', [pos for span in offs for pos in span])
+            }
+            for ids, offs in zip(batch['input_ids'], offsets)
+        ]
+
+    def pretokenize(self, texts, consumer='roberta'):
+        """Warm the encoding cache for a batch of texts with a single tokenizer call"""
+        if self._get_tokenizer(consumer) is None:
+            return 0
+        pending = {}
+        for text in texts:
+            if not text or not isinstance(text, str):
+                continue
+            key = EncodingCache.key(f'{consumer}:raw', text)
+            if key not in pending and self.encoding_cache.get(key) is None:
+                pending[key] = text
+        if pending:
+            for key, encoded in zip(pending, self._encode_batch(list(pending.values()), consumer)):
+                self.encoding_cache.put(key, encoded)
+        return len(pending)
+
+    def add_special_tokens(self, tokenizer, ids, pair_ids=None):
+        """Wrap already-encoded ids (or a pair) in the tokenizer's special tokens"""
+        key = (id(tokenizer), pair_ids is not None)
+        if key not in self.special_token_layouts:
+            # Derive the template by encoding a probe word with and without special tokens
+            # (build_inputs_with_special_tokens is not available on every tokenizer version)
+            probe = tokenizer('a', add_special_tokens=False)['input_ids']
+            full = list(tokenizer('a', 'a')['input_ids'] if pair_ids is not None else tokenizer('a')['input_ids'])
+            pieces, rest = [], full
+            for _ in range(2 if pair_ids is not None else 1):
+                at = next(i for i in range(len(rest)) if rest[i:i + len(probe)] == probe)
+                pieces.append(rest[:at])
+                rest = rest[at + len(probe):]
+            self.special_token_layouts[key] = pieces + [rest]
+        layout = self.special_token_layouts[key]
+        if pair_ids is None:
+            return layout[0] + list(ids) + layout[1]
+        return layout[0] + list(ids) + layout[1] + list(pair_ids) + layout[2]
+
+    def build_model_inputs(self, sequences, consumer='roberta'):
+        """Add special tokens to already-encoded id sequences and pad them into one model batch"""
+        tokenizer = self._get_tokenizer(consumer)
+        return tokenizer.pad(
+            {'input_ids': [self.add_special_tokens(tokenizer, ids) for ids in sequences]},
+            return_tensors='pt'
+        )
+
+    def count_tokens(self, text, consumer):
+        """Count tokens with the consumer's tokenizer, falling back to the estimate"""
+        if self._get_tokenizer(consumer) is None:
+            return self.estimate_tokens(text)
+        if not text:
+            return 0
+        return len(self._encode(text, consumer)['input_ids'])
+
+    def truncate_to_tokens(self, text, max_tokens, consumer):
+        """Truncate text to a token budget, preferring to end on a sentence boundary"""
+        if not text:
+            return text, 0
+
+        tokenizer = self._get_tokenizer(consumer)
+        if tokenizer is None:
+            tokens = self.estimate_tokens(text)
+            if tokens <= max_tokens:
+                return text, tokens
+            # Scale the character cut by this text's own chars-per-token ratio
+            truncated = self.truncate_text(text, int(len(text) * max_tokens / tokens))
+            return truncated, self.estimate_tokens(truncated)
+
+        encoded = self._encode(text, consumer)
+        ids, offsets = encoded['input_ids'], encoded['offset_mapping']
+        if len(ids) <= max_tokens:
+            return text, len(ids)
+        if offsets is None:
+            return tokenizer.decode(ids[:max_tokens].tolist()), max_tokens
+
+        cut = offsets[2 * max_tokens - 1]
+        truncated = text[:cut]
+        last_sentence = max(truncated.rfind('.'), truncated.rfind('!'), truncated.rfind('?'))
+        if last_sentence > cut * 0.7:  # If we can keep most of the text
+            truncated = truncated[:last_sentence + 1]
+            kept = sum(1 for end in offsets[1:2 * max_tokens:2] if end <= last_sentence + 1)
+            return truncated, kept
+        return truncated, max_tokens
+
+    def chunk_by_tokens(self, text, max_tokens, consumer, max_chunks=None, overlap=0):
+        """Split text into windows of at most max_tokens tokens, overlapping by `overlap` tokens"""
+        tokenizer = self._get_tokenizer(consumer)
+        if tokenizer is None:
+            step = max(1, max_tokens - overlap)
+            chunks = [
+                text[i:i + max_tokens * CHARS_PER_TOKEN]
+                for i in range(0, len(text), step * CHARS_PER_TOKEN)
+            ]
+        else:
+            encoded = self._encode(text, consumer)
+            ids, offsets = encoded['input_ids'], encoded['offset_mapping']
+            chunks = [
+                tokenizer.decode(ids[start:end].tolist()) if offsets is None
+                else text[offsets[2 * start]:offsets[2 * end - 1]]
+                for start, end in self.token_windows(len(ids), max_tokens, overlap)
+            ]
+
+        chunks = [c for c in chunks if c.strip()]
+        return self.sample_windows(chunks, max_chunks) or [text]
+
+    @staticmethod
+    def token_windows(n_tokens, max_tokens, overlap=0):
+        """(start, end) token ranges of windows covering n_tokens, overlapping by `overlap` tokens"""
+        step = max(1, max_tokens - overlap)
+        windows = []
+        for start in range(0, n_tokens, step):
+            windows.append((start, min(start + max_tokens, n_tokens)))
+            if start + max_tokens >= n_tokens:
+                break
+        return windows
+
+    @staticmethod
+    def sample_windows(windows, max_chunks):
+        """Keep the lede plus evenly spaced windows so the whole article is sampled"""
+        if not max_chunks or len(windows) <= max_chunks:
+            return windows
+        if max_chunks == 1:
+            return windows[:1]
+        last = len(windows) - 1
+        picks = sorted({round(i * last / (max_chunks - 1)) for i in range(max_chunks)})
+        return [windows[i] for i in picks]
+
+    def _pool_window_logits(self, logits, pooling):
+        """Pool per-window logits into a single class distribution"""
+        import torch
+
+        if logits.size(0) == 1:
+            return torch.nn.functional.softmax(logits[0], dim=-1)
+        if pooling == 'max':
+            pooled = logits.max(dim=0).values
+        elif pooling == 'attention':
+            # Weight windows by how decisive they are (top-2 logit margin)
+            top2 = logits.topk(2, dim=-1).values
+            weights = torch.nn.functional.softmax(top2[:, 0] - top2[:, 1], dim=0)
+            pooled = (weights.unsqueeze(-1) * logits).sum(dim=0)
+        else:
+            pooled = logits.mean(dim=0)
+        return torch.nn.functional.softmax(pooled, dim=-1)
+
+    def fit_prompt_content(self, content, consumer):
+        """Fit content into an API provider's token budget and report usage"""
+        budget = TOKEN_BUDGETS[consumer]
+        original_tokens = self.estimate_tokens(content)
+        safe_content, used_tokens = self.truncate_to_tokens(content, budget, consumer)
+        return safe_content, {
+            'content_tokens': used_tokens,
+            'original_tokens': original_tokens,
+            'budget': budget,
+            'truncated': used_tokens < original_tokens,
+            'estimated': True
+        }
+
+    def _provider_usage(self, result):
+        """Extract billed token counts from an OpenAI-compatible response"""
+        usage = result.get('usage') or {}
+        if not usage:
+            return {}
+        return {
+            'prompt_tokens': usage.get('prompt_tokens'),
+            'completion_tokens': usage.get('completion_tokens'),
+            'total_tokens': usage.get('total_tokens'),
+            'estimated': False
+        }
+
     def call_openai_api(self, title, content):
         """Call OpenAI API for fact-checking"""
         try:
@@ -522,6 +1576,7 @@ class EnhancedMultiAPIEnsemble:
                 return {'error': 'OpenAI API key not available'}
 
             logger.info("🤖 Calling OpenAI API...")
+            safe_content, token_usage = self.fit_prompt_content(content, 'openai')
             headers = {
                 'Authorization': f'Bearer {self.api_keys["openai"]}',
                 'Content-Type': 'application/json'
@@ -531,7 +1586,7 @@ class EnhancedMultiAPIEnsemble:
 Analyze this news content for truthfulness and reliability. Return only a JSON response.
 
 Title: {title}
-Content: {self.truncate_text(content, 500)}
+Content: {safe_content}
 
 Analyze for:
 1. Factual accuracy indicators
@@ -556,8 +1611,9 @@ Return JSON format:
                 "max_tokens": 300
             }
 
-            response = requests.post(
-                'https://api.openai.com/v1/chat/completions',
+            response = self.cassettes.post(
+                'openai',
+                f'{OPENAI_BASE_URL}/chat/completions',
                 headers=headers,
                 json=data,
                 timeout=15
@@ -566,6 +1622,7 @@ Return JSON format:
             if response.status_code == 200:
                 result = response.json()
                 content_text = result['choices'][0]['message']['content']
+                token_usage.update(self._provider_usage(result))
                 
                 try:
                     # Try to parse JSON response
@@ -576,7 +1633,8 @@ Return JSON format:
                         'confidence': float(parsed.get('confidence', 50)),
                         'reasoning': f"OpenAI analysis: {parsed.get('reasoning', 'No detailed reasoning provided')}",
                         'factual_score': parsed.get('factual_score', 50),
-                        'credibility_score': parsed.get('credibility_score', 50)
+                        'credibility_score': parsed.get('credibility_score', 50),
+                        'token_usage': token_usage
                     }
                 except json.JSONDecodeError:
                     # Fallback parsing
@@ -585,7 +1643,8 @@ Return JSON format:
                         'model': 'OpenAI-GPT-3.5',
                         'label': 'Real' if is_trustworthy else 'Fake',
                         'confidence': 70,
-                        'reasoning': f"OpenAI analysis: {content_text[:200]}"
+                        'reasoning': f"OpenAI analysis: {content_text[:200]}",
+                        'token_usage': token_usage
                     }
             else:
                 return {'error': f'OpenAI API error: {response.status_code}'}
@@ -601,6 +1660,7 @@ Return JSON format:
                 return {'error': 'Groq API key not available'}
 
             logger.info("🤖 Calling Groq API...")
+            safe_content, token_usage = self.fit_prompt_content(content, 'groq')
             headers = {
                 'Authorization': f'Bearer {self.api_keys["groq"]}',
                 'Content-Type': 'application/json'
@@ -610,7 +1670,7 @@ Return JSON format:
 Fact-check this news content. Be concise and analytical.
 
 Title: {title}
-Content: {self.truncate_text(content, 500)}
+Content: {safe_content}
 
 Provide:
 - VERDICT: Reliable/Unreliable
@@ -628,8 +1688,9 @@ Format as: VERDICT: [verdict] | CONFIDENCE: [number]% | REASONING: [analysis]
                 "max_tokens": 250
             }
 
-            response = requests.post(
-                'https://api.groq.com/openai/v1/chat/completions',
+            response = self.cassettes.post(
+                'groq',
+                f'{GROQ_BASE_URL}/chat/completions',
                 headers=headers,
                 json=data,
                 timeout=10
@@ -638,6 +1699,7 @@ Format as: VERDICT: [verdict] | CONFIDENCE: [number]% | REASONING: [analysis]
             if response.status_code == 200:
                 result = response.json()
                 content_text = result['choices'][0]['message']['content']
+                token_usage.update(self._provider_usage(result))
 
                 # Parse Groq response
                 verdict = 'Reliable' if 'VERDICT: Reliable' in content_text or 'reliable' in content_text.lower() else 'Unreliable'
@@ -654,7 +1716,8 @@ Format as: VERDICT: [verdict] | CONFIDENCE: [number]% | REASONING: [analysis]
                     'label': 'Real' if verdict == 'Reliable' else 'Fake',
                     'confidence': confidence,
                     'reasoning': f"Groq analysis: {content_text[:200]}",
-                    'raw_verdict': verdict
+                    'raw_verdict': verdict,
+                    'token_usage': token_usage
                 }
             else:
                 return {'error': f'Groq API error: {response.status_code}'}
@@ -663,6 +1726,26 @@ Format as: VERDICT: [verdict] | CONFIDENCE: [number]% | REASONING: [analysis]
             logger.error(f"❌ Groq API error: {e}")
             return {'model': 'Groq-Mixtral', 'error': str(e)}
 
+    def serper_search(self, query, headers):
+        """Serper results for a query via the shared cache; returns (results or None, cached)"""
+        key = hashlib.sha1(query.encode('utf-8')).hexdigest()
+        results = self.cache.get('search', key)
+        if results is not None:
+            return results, True
+
+        response = self.cassettes.post(
+            'serper',
+            f'{SERPER_BASE_URL}/search',
+            json={'q': query, 'num': 5},
+            headers=headers,
+            timeout=8
+        )
+        if response.status_code != 200:
+            return None, False
+        results = response.json()
+        self.cache.set('search', key, results)
+        return results, False
+
     def search_and_verify(self, title, content):
         """Fixed search verification with better scoring logic"""
         try:
@@ -684,15 +1767,9 @@ Format as: VERDICT: [verdict] | CONFIDENCE: [number]% | REASONING: [analysis]
 
                 for query in search_queries[:2]:  # Try first 2 queries
                     try:
-                        response = requests.post(
-                            'https://google.serper.dev/search',
-                            json={'q': query, 'num': 5},
-                            headers=headers,
-                            timeout=8
-                        )
-
-                        if response.status_code == 200:
-                            results = response.json()
+                        results, cached = self.serper_search(query, headers)
+
+                        if results is not None:
                             organic_results = results.get('organic', [])
                             all_results.extend(organic_results)
                             total_results_found += len(organic_results)
@@ -725,7 +1802,8 @@ Format as: VERDICT: [verdict] | CONFIDENCE: [number]% | REASONING: [analysis]
                                     logger.info(f"ℹ️ Regular source: {result_link[:30]} - {result_title}")
 
                             logger.info(f"🔍 Search summary: {trusted_sources_found} trusted / {total_results_found} total")
-                            time.sleep(0.5)  # Small delay between requests
+                            if not cached:
+                                time.sleep(0.5)  # Small delay between requests
 
                     except requests.exceptions.Timeout:
                         logger.warning("⚠️ Serper search timeout")
@@ -811,57 +1889,152 @@ Format as: VERDICT: [verdict] | CONFIDENCE: [number]% | REASONING: [analysis]
                 'reasoning': 'Search verification failed, using neutral stance'
             }
 
+    def _roberta_forward(self, inputs):
+        """RoBERTa forward pass returning pooled class probabilities"""
+        import torch
+
+        inputs = {k: v.to(device) for k, v in inputs.items()}
+        model_data = self.models['roberta']
+        with torch.no_grad():
+            try:
+                outputs = self._call_roberta(model_data, inputs)
+            except Exception as e:
+                if not self._fallback_to_eager(e):
+                    raise
+                outputs = self._call_roberta(model_data, inputs)
+            logits = outputs[0] if isinstance(outputs, tuple) else outputs['logits']
+            return self._pool_window_logits(logits, ROBERTA_POOLING)
+
+    def _call_roberta(self, model_data, inputs):
+        """Invoke the RoBERTa module; traced modules take positional tensors"""
+        if model_data.get('execution_mode') == 'torchscript':
+            return model_data['model'](inputs['input_ids'], inputs['attention_mask'])
+        return model_data['model'](**inputs)
+
     def predict_roberta_local(self, title, content):
         """Local RoBERTa prediction"""
         try:
             if 'roberta' not in self.models:
                 return {'error': 'RoBERTa model not loaded'}
 
-            logger.info("🧠 Running Local RoBERTa prediction...")
-            import torch
-
-            model_data = self.models['roberta']
-            safe_title = self.truncate_text(title, 100)
-            safe_content = self.truncate_text(content, 300)
-            input_str = f"{safe_title} {safe_content}"
-
-            # Tokenize input
-            inputs = model_data['tokenizer'](
-                input_str, 
-                return_tensors='pt', 
-                max_length=512, 
-                truncation=True, 
-                padding=True
-            )
-
-            # Move to device
-            inputs = {k: v.to(device) for k, v in inputs.items()}
-
-            # Get predictions
-            with torch.no_grad():
-                outputs = model_data['model'](**inputs)
-                predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-                predicted_class = torch.argmax(predictions, dim=-1).item()
-                confidence = torch.max(predictions).item() * 100
-
-            # Map predictions (0 = Real, 1 = Fake typically for this model)
-            label = 'Real' if predicted_class == 0 else 'Fake'
-            
-            return {
-                'model': 'RoBERTa-Local',
-                'label': label,
-                'confidence': round(confidence, 1),
-                'reasoning': f'RoBERTa local model prediction: class {predicted_class} with {confidence:.1f}% confidence'
-            }
+            # Hold the model for the whole request so a concurrent load can't evict it mid-inference
+            with self.models.lease('roberta'):
+                return self._predict_roberta(title, content)
 
         except Exception as e:
             logger.error(f"❌ RoBERTa local prediction error: {e}")
             return {'model': 'RoBERTa-Local', 'error': str(e)}
 
+    def _predict_roberta(self, title, content):
+        """RoBERTa prediction body; the caller holds a lease on the model"""
+        logger.info("🧠 Running Local RoBERTa prediction...")
+        import torch
+
+        model_data = self.models['roberta']
+        tokenizer = model_data['tokenizer']
+        tokenize_start = time.perf_counter()
+
+        # Split the model window between title and content
+        max_length = min(TOKEN_BUDGETS['roberta'], tokenizer.model_max_length)
+        window_tokens = max_length - tokenizer.num_special_tokens_to_add()
+        _, title_tokens = self.truncate_to_tokens(title, TOKEN_BUDGETS['roberta_title'], 'roberta')
+        title_ids = self._encode(title, 'roberta')['input_ids'][:title_tokens] if title_tokens else []
+        separator = self._encode(' ', 'roberta')['input_ids'] if title_ids and content else []
+        content_budget = window_tokens - title_tokens - len(separator)
+
+        # Windows are cut from the cached content ids, so nothing is tokenized a second time
+        content_ids = self._encode(content, 'roberta')['input_ids'] if content else []
+        content_tokens = len(content_ids)
+        if ROBERTA_WINDOWING and content_tokens > content_budget:
+            overlap = min(ROBERTA_WINDOW_OVERLAP, content_budget // 2)
+            chunks = self.sample_windows([
+                content_ids[start:end]
+                for start, end in self.token_windows(content_tokens, content_budget, overlap)
+            ], ROBERTA_MAX_WINDOWS)
+        else:
+            chunks = [content_ids[:self.truncate_to_tokens(content, content_budget, 'roberta')[1]]]
+
+        # All windows as one padded batch of title + separator + window ids
+        inputs = self.build_model_inputs([list(title_ids) + list(separator) + list(chunk) for chunk in chunks])
+        tokenize_ms = (time.perf_counter() - tokenize_start) * 1000
+        used_tokens = int(inputs['attention_mask'].sum().item())
+
+        # Get predictions in one forward pass on the inference pool, pooled over windows
+        predictions = self.run_inference(self._roberta_forward, inputs)
+        predicted_class = torch.argmax(predictions).item()
+        confidence = torch.max(predictions).item() * 100
+
+        # Map predictions (0 = Real, 1 = Fake typically for this model)
+        label = 'Real' if predicted_class == 0 else 'Fake'
+        
+        return {
+            'model': 'RoBERTa-Local',
+            'label': label,
+            'confidence': round(confidence, 1),
+            'reasoning': f'RoBERTa local model prediction: class {predicted_class} with {confidence:.1f}% confidence over {len(chunks)} window(s)',
+            'windows': len(chunks),
+            'pooling': ROBERTA_POOLING if len(chunks) > 1 else 'none',
+            'token_usage': {
+                'input_tokens': used_tokens,
+                'original_tokens': self.count_tokens(title, 'roberta') + content_tokens,
+                'budget': max_length * len(chunks),
+                'windows': len(chunks),
+                'truncated': content_tokens > content_budget * len(chunks),
+                'estimated': False,
+                'tokenize_ms': round(tokenize_ms, 2)
+            }
+        }
 
 # Initialize the ensemble
 ensemble = EnhancedMultiAPIEnsemble()
 
+
+def request_priority(data, default):
+    """Priority class from the JSON body or X-Priority header, falling back to the endpoint default"""
+    priority = (data or {}).get('priority') or request.headers.get('X-Priority') or default
+    return priority if priority in ensemble.admission.classes else default
+
+
+def article_texts(article):
+    """(title, content) of a batch article, or None when the entry is malformed"""
+    if not isinstance(article, dict):
+        return None
+    title, content = article.get('title') or '', article.get('content') or ''
+    if not isinstance(title, str) or not isinstance(content, str):
+        return None
+    return title, content
+
+
+def overloaded_response(error):
+    response = jsonify({
+        'success': False,
+        'error': str(error),
+        'processing_mode': 'shed'
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+@app.before_request
+def track_request_start():
+    g.request_started = time.perf_counter()
+    request_stats.start()
+
+
+@app.after_request
+def record_inbound_request(response):
+    if ensemble.cassettes.mode == 'record' and request.path.startswith('/analyze'):
+        elapsed_ms = (time.perf_counter() - g.request_started) * 1000
+        ensemble.cassettes.record_inbound(request.path, request.get_json(silent=True), elapsed_ms, response.status_code)
+    return response
+
+
+@app.teardown_request
+def track_request_end(exc=None):
+    request_stats.finish()
+
+
 @app.route('/analyze', methods=['POST'])
 def analyze_content():
     """Main analysis endpoint"""
@@ -883,14 +2056,34 @@ def analyze_content():
                 'error': 'Either title or content is required'
             }), 400
             
-        # Use the main comprehensive ensemble prediction
-        analysis_result = ensemble.comprehensive_ensemble_predict(title, content)
+        try:
+            fields = parse_fields(data)
+            # Optional per-request voter budget (milliseconds and/or USD)
+            budget_ms = parse_budget(data, 'budget_ms')
+            budget_usd = parse_budget(data, 'budget_usd')
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
+        # Use the main comprehensive ensemble prediction (shared with identical in-flight requests)
+        analysis_result, coalesced, processing_mode = ensemble.analyze_coalesced(
+            title, content, budget_ms, budget_usd,
+            priority=request_priority(data, 'interactive'),
+            url=data.get('url')
+        )
         
         return jsonify({
             'success': True,
-            'analysis': analysis_result
+            'analysis': project_analysis(analysis_result, fields),
+            'coalesced': coalesced,
+            'processing_mode': processing_mode
         })
         
+    except Overloaded as e:
+        return overloaded_response(e)
+
     except Exception as e:
         logger.error(f"Analysis endpoint error: {e}")
         return jsonify({
@@ -913,17 +2106,58 @@ def analyze_batch():
                 'error': 'Articles array is required'
             }), 400
 
+        try:
+            fields = parse_fields(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
         articles = data.get('articles', [])
+        if not isinstance(articles, list):
+            return jsonify({
+                'success': False,
+                'error': 'articles must be an array'
+            }), 400
         max_batch_size = 5  # Process in smaller batches for RSS
         
         if len(articles) > max_batch_size:
             articles = articles[:max_batch_size]
 
+        # Encode all titles/contents in one fast-tokenizer call up front
+        ensemble.pretokenize(
+            text for article in articles if article_texts(article)
+            for text in article_texts(article)
+        )
+
+        priority = request_priority(data, 'batch')
+
+        # One multi-get for every article's cached verdict, one multi-set for the new ones;
+        # malformed entries are left out here and reported per index below
+        texts = [article_texts(a) for a in articles]
+        keys = [ensemble.verdict_cache_key(*t) if t else None for t in texts]
+        cached_verdicts = ensemble.cache.get_many('verdict', [key for key in keys if key is not None])
+        fresh_verdicts = {}
+
+        # Queue every uncached article for the pipeline voters at once so they share batches
+        ensemble.prefetch_pipeline_voters(
+            t for t, key in zip(texts, keys) if key is not None and key not in cached_verdicts
+        )
+
         results = []
         for i, article in enumerate(articles):
             try:
-                title = article.get('title', '')
-                content = article.get('content', '')
+                if texts[i] is None:
+                    results.append({
+                        'success': False,
+                        'error': 'Article must be an object with string title and content',
+                        'index': i
+                    })
+                    continue
+
+                title, content = texts[i]
+                url = article.get('url') or article.get('link')
                 
                 if not title and not content:
                     results.append({
@@ -933,15 +2167,33 @@ def analyze_batch():
                     })
                     continue
 
-                # Use the comprehensive ensemble prediction
-                analysis_result = ensemble.comprehensive_ensemble_predict(title, content)
+                if keys[i] in cached_verdicts:
+                    analysis_result, processing_mode = cached_verdicts[keys[i]], 'cached'
+                    if url:
+                        ensemble.record_verdict(url, analysis_result)
+                else:
+                    # Use the comprehensive ensemble prediction
+                    analysis_result, coalesced, processing_mode = ensemble.analyze_coalesced(
+                        title, content, priority=priority, url=url, use_cache=False
+                    )
+                    if not coalesced and ensemble.cacheable_verdict(analysis_result, processing_mode):
+                        fresh_verdicts[keys[i]] = analysis_result
                 
                 results.append({
                     'success': True,
                     'index': i,
-                    'analysis': analysis_result
+                    'analysis': project_analysis(analysis_result, fields),
+                    'processing_mode': processing_mode
                 })
                 
+            except Overloaded as e:
+                results.append({
+                    'success': False,
+                    'error': str(e),
+                    'index': i,
+                    'processing_mode': 'shed'
+                })
+
             except Exception as e:
                 logger.error(f"Batch analysis error for article {i}: {e}")
                 results.append({
@@ -950,6 +2202,8 @@ def analyze_batch():
                     'index': i
                 })
 
+        ensemble.cache.set_many('verdict', fresh_verdicts)
+
         return jsonify({
             'success': True,
             'results': results,
@@ -964,6 +2218,59 @@ def analyze_batch():
             'error': str(e)
         }), 500
 
+@app.route('/verdict', methods=['GET'])
+def lookup_verdict():
+    """Stored verdict for a previously analyzed URL (index lookup only, no analysis)"""
+    url = request.args.get('url', '')
+    if not url:
+        return jsonify({
+            'success': False,
+            'error': 'url query parameter is required'
+        }), 400
+    if not ensemble.verdicts:
+        return jsonify({
+            'success': False,
+            'error': 'Verdict store is disabled'
+        }), 503
+
+    try:
+        verdict = ensemble.verdicts.lookup(url)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': f'Invalid url: {e}'
+        }), 400
+
+    if verdict is None:
+        return jsonify({'success': True, 'found': False})
+    return jsonify({
+        'success': True,
+        'found': True,
+        'url': verdict['url'],
+        'url_hash': verdict['url_hash'],
+        'analysis': verdict['analysis'],
+        'analyzed_at': verdict['analyzed_at']
+    })
+
+
+@app.route('/verdict/bloom', methods=['GET'])
+def verdict_bloom():
+    """Bloom filter over stored URL hashes, so callers can skip lookups for unseen URLs"""
+    if not ensemble.verdicts:
+        return jsonify({
+            'success': False,
+            'error': 'Verdict store is disabled'
+        }), 503
+    # Clients keep the filter and revalidate it; an unchanged filter costs a 304, not the full bit array
+    bloom = ensemble.verdicts.bloom  # maintenance may swap in a rebuilt filter meanwhile
+    etag = bloom.etag()
+    if etag in request.if_none_match:
+        return '', 304, {'ETag': f'"{etag}"'}
+    response = jsonify(dict(bloom.export(), etag=etag, success=True))
+    response.set_etag(etag)
+    return response
+
+
 @app.route('/analyze-quick', methods=['POST'])
 def analyze_quick():
     """Quick analysis for RSS snippets"""
@@ -984,12 +2291,20 @@ def analyze_quick():
                 'error': 'Either title or content is required'
             }), 400
 
+        try:
+            fields = parse_fields(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
         # Use enhanced LLaMA fallback for speed
-        analysis_result = ensemble.predict_llama_enhanced_fallback_only(title, content)
+        analysis_result = ensemble.call_voter('llama', ensemble.predict_llama_enhanced_fallback_only, title, content)
 
         return jsonify({
             'success': True,
-            'analysis': analysis_result,
+            'analysis': project_analysis(analysis_result, fields),
             'processing_mode': 'quick'
         })
 
@@ -1032,7 +2347,36 @@ def health_check_detailed():
             'average_response_time': '2-5 seconds',
             'supported_languages': ['English'],
             'max_content_length': 4000,
-            'batch_size_limit': 5
+            'batch_size_limit': 5,
+            'token_budgets': TOKEN_BUDGETS,
+            'tokenizer_cache': ensemble.encoding_cache.stats(),
+            'inference_threads': ensemble.inference_config,
+            'roberta_execution_mode': (ensemble.models.peek('roberta') or {}).get('execution_mode', 'eager'),
+            'model_registry': ensemble.models.stats(),
+            'verdict_store': ensemble.verdicts.stats() if ensemble.verdicts else None,
+            'pipeline_voters': ensemble.pipeline_voter_stats(),
+            'shared_cache': ensemble.cache.stats(),
+            'responses': {
+                'json_engine': app.json.engine,
+                'endpoints': app.json.stats.snapshot()
+            },
+            'warmup': ensemble.warmup_stats,
+            'provider_cassettes': ensemble.cassettes.summary(),
+            'single_flight': ensemble.single_flight.stats(),
+            'voter_policy': ensemble.voter_policy.name,
+            'admission': ensemble.admission.stats(),
+            'process_pool': ensemble.process_pool.stats() if ensemble.process_pool else None,
+            'voter_stats': ensemble.voter_stats.snapshot(),
+            'runtime': {
+                'requests': request_stats.snapshot(reset_peak=request.args.get('reset_peak') == 'true'),
+                'inference_queue_depth': ensemble.inference_executor._work_queue.qsize() if ensemble.inference_executor else 0
+            },
+            'roberta_windowing': {
+                'enabled': ROBERTA_WINDOWING,
+                'max_windows': ROBERTA_MAX_WINDOWS,
+                'overlap_tokens': ROBERTA_WINDOW_OVERLAP,
+                'pooling': ROBERTA_POOLING
+            }
         }
     })
 
@@ -1041,7 +2385,8 @@ def health_check_detailed():
 def health_check():
     """Health check endpoint"""
     return jsonify({
-        'status': 'healthy',
+        'status': 'healthy' if ensemble.ready else 'warming_up',
+        'ready': ensemble.ready,
         'ensemble_info': {
             'loaded_models': ensemble.loaded_models,
             'failed_models': ensemble.failed_models,
@@ -1049,12 +2394,15 @@ def health_check():
         }
     })
 
-if __name__ == '__main__':
-    logger.info("🚀 Starting Enhanced Multi-API Ensemble Service...")
-    
+
+def startup():
+    """Load and warm local models and start worker pools; call once per server process before serving
+    (e.g. from a WSGI runner's post-fork hook)"""
     # Load models
     try:
-        models_loaded = ensemble.load_local_models()
+        if not LOAD_LOCAL_MODELS:
+            logger.info("⏭️ LOAD_LOCAL_MODELS=false, skipping local models")
+        models_loaded = LOAD_LOCAL_MODELS and ensemble.load_local_models()
         if models_loaded:
             logger.info(f"✅ Local models loaded: {ensemble.loaded_models}")
         else:
@@ -1065,6 +2413,18 @@ if __name__ == '__main__':
             
     except Exception as e:
         logger.error(f"❌ Error loading models: {e}")
-    
+
+    # Optionally move CPU-heavy voters into worker processes
+    if INFERENCE_BACKEND == 'process':
+        ensemble.start_process_pool()
+
+    # Keep HTTP worker threads off the inference cores
+    ensemble.pin_http_threads()
+
+
+if __name__ == '__main__':
+    logger.info("🚀 Starting Enhanced Multi-API Ensemble Service...")
+    startup()
+
     # Start Flask app
-    app.run(host='0.0.0.0', port=5001, debug=False)
+    app.run(host='0.0.0.0', port=SERVICE_PORT, debug=False, threaded=True)
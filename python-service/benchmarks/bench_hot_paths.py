@@ -0,0 +1,149 @@
+"""
+Microbenchmarks for the pure-Python hot paths behind /analyze and /analyze-quick.
+
+Covers predict_llama_enhanced_fallback_only, generate_analysis_based_summary,
+truncate_text and aggregate_predictions over short, medium and very long
+articles. Every run is appended to a JSONL history file; with --baseline the
+run fails if any benchmark is slower than the baseline by more than
+--max-slowdown.
+
+Usage (from python-service/):
+    python benchmarks/bench_hot_paths.py --save-baseline benchmarks/results/hot_paths_baseline.json
+    python benchmarks/bench_hot_paths.py --baseline benchmarks/results/hot_paths_baseline.json --max-slowdown 1.25
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import app
+from corpus import CORPUS, SAMPLE_PREDICTIONS
+
+
+def build_benchmarks(ensemble):
+    """Return {name: zero-argument callable} for every hot path and corpus size"""
+    benchmarks = {}
+    for size, (title, content) in CORPUS.items():
+        benchmarks[f'llama_fallback[{size}]'] = (
+            lambda t=title, c=content: ensemble.predict_llama_enhanced_fallback_only(t, c)
+        )
+        benchmarks[f'summary_real[{size}]'] = (
+            lambda t=title, c=content: ensemble.generate_analysis_based_summary(t, c, 'Real', 82.0)
+        )
+        benchmarks[f'summary_fake[{size}]'] = (
+            lambda t=title, c=content: ensemble.generate_analysis_based_summary(t, c, 'Fake', 74.0)
+        )
+        benchmarks[f'truncate_text[{size}]'] = lambda c=content: ensemble.truncate_text(c, 400)
+        benchmarks[f'aggregate[{size}]'] = (
+            lambda t=title, c=content: ensemble.aggregate_predictions(t, c, [dict(p) for p in SAMPLE_PREDICTIONS])
+        )
+    return benchmarks
+
+
+def measure(fn, rounds, min_round_time):
+    """Calibrate a loop count so each round takes min_round_time, then time `rounds` rounds"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_round_time:
+            break
+        loops *= 2
+
+    per_call_us = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        per_call_us.append((time.perf_counter() - start) / loops * 1e6)
+    return {
+        'min_us': round(min(per_call_us), 2),
+        'median_us': round(statistics.median(per_call_us), 2),
+        'stdev_us': round(statistics.stdev(per_call_us), 2) if rounds > 1 else 0.0,
+        'loops': loops,
+        'rounds': rounds
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def check_regressions(results, baseline, max_slowdown):
+    failures = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if base and stats['median_us'] > base['median_us'] * max_slowdown:
+            failures.append(
+                f"{name}: {base['median_us']}us -> {stats['median_us']}us "
+                f"({stats['median_us'] / base['median_us']:.2f}x, limit {max_slowdown:.2f}x)"
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--filter', default='', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--rounds', type=int, default=7)
+    parser.add_argument('--min-round-time', type=float, default=0.05, help='Seconds per timing round')
+    parser.add_argument('--history', default=os.path.join(BENCH_DIR, 'results', 'hot_paths.jsonl'))
+    parser.add_argument('--save-baseline', help='Write this run as the baseline JSON')
+    parser.add_argument('--baseline', help='Fail if slower than this baseline JSON')
+    parser.add_argument('--max-slowdown', type=float, default=1.25)
+    args = parser.parse_args()
+
+    # The voters log at INFO on every call; keep that out of the timings
+    logging.getLogger(app.__name__).setLevel(logging.WARNING)
+
+    ensemble = app.ensemble
+    results = {}
+    for name, fn in build_benchmarks(ensemble).items():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = measure(fn, args.rounds, args.min_round_time)
+        print(f"{name:<26} median {results[name]['median_us']:>12.2f}us  "
+              f"min {results[name]['min_us']:>12.2f}us  (x{results[name]['loops']})")
+
+    record = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results
+    }
+    os.makedirs(os.path.dirname(args.history), exist_ok=True)
+    with open(args.history, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = check_regressions(results, json.load(f), args.max_slowdown)
+        if failures:
+            print("Benchmarks slower than baseline:")
+            for line in failures:
+                print(f"  {line}")
+            sys.exit(1)
+        print("All benchmarks within threshold")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Sweep inference-pool threading configurations for CPU RoBERTa inference.
+
+For every (workers, intra-op threads) pair, drives predict_roberta_local from
+a fixed number of concurrent client threads (standing in for Flask request
+threads) and reports throughput and latency percentiles.
+
+Usage (from python-service/):
+    CUDA_VISIBLE_DEVICES= python benchmarks/bench_inference_threads.py \
+        --workers 1,2,4 --intra-op 1,2,4,8 --clients 16 --duration 20 --cpus 0-15
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+TITLE = "Government confirms revised budget figures after audit"
+CONTENT = (
+    "The finance ministry confirmed on Monday that revised budget figures would be "
+    "published next week, according to an official statement. The national audit "
+    "office said its investigation found discrepancies in two departments, and "
+    "independent economists at the university welcomed the additional data. "
+) * 6
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_load(ensemble, clients, duration):
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        # Vary the input per client so the encoding cache doesn't hide tokenization cost
+        content = f"{CONTENT} Report {index}."
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            ensemble.predict_roberta_local(TITLE, content)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / wall, 2),
+        'p50_ms': round(percentile(latencies, 50), 1),
+        'p95_ms': round(percentile(latencies, 95), 1),
+        'p99_ms': round(percentile(latencies, 99), 1),
+        'mean_ms': round(statistics.mean(latencies), 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', default='1,2,4', help='Inference pool sizes to try')
+    parser.add_argument('--intra-op', default='1,2,4', help='torch intra-op thread counts to try')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent request threads')
+    parser.add_argument('--duration', type=float, default=15.0, help='Seconds per configuration')
+    parser.add_argument('--cpus', default='', help='Inference core list, e.g. "0-15"')
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    ensemble = app.ensemble
+    ensemble.load_local_models()
+    if 'roberta' not in ensemble.models:
+        sys.exit("RoBERTa model failed to load")
+
+    rows = []
+    for workers in [int(w) for w in args.workers.split(',')]:
+        for intra_op in [int(n) for n in args.intra_op.split(',')]:
+            config = ensemble.configure_inference_threads(workers, intra_op, args.cpus)
+            run_load(ensemble, args.clients, min(3.0, args.duration))  # warm up
+            result = run_load(ensemble, args.clients, args.duration)
+            result.update({'workers': workers, 'intra_op': intra_op, 'cpus': len(config['cpus'])})
+            rows.append(result)
+            print(f"workers={workers:<2} intra_op={intra_op:<2} rps={result['rps']:<8} "
+                  f"p50={result['p50_ms']}ms p95={result['p95_ms']}ms p99={result['p99_ms']}ms")
+
+    best = max(rows, key=lambda r: r['rps'])
+    print(f"\nBest throughput: workers={best['workers']} intra_op={best['intra_op']} "
+          f"({best['rps']} req/s, p99 {best['p99_ms']}ms)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'clients': args.clients, 'device': app.device, 'results': rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
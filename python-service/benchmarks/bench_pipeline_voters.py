@@ -0,0 +1,98 @@
+"""
+Throughput and latency of the batched zero-shot and sentiment voters.
+
+Loads the BART-MNLI and sentiment pipelines and drives one voter from
+concurrent client threads. This is repeated for each batch size, so
+unbatched (batch size 1) and micro-batched execution can be compared.
+Reports items/s, p50/p95 per-call latency, the average batch actually
+formed, and how many calls exceeded the voter's latency budget.
+
+Usage (from python-service/):
+    ZERO_SHOT_VOTER=true SENTIMENT_VOTER=true python benchmarks/bench_pipeline_voters.py --voter zeroshot --batch-sizes 1,4,8,16 --clients 16
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import app
+from corpus import CORPUS
+from pipeline_batcher import MicroBatcher
+
+
+def drive(ensemble, voter, clients, duration):
+    title, content = CORPUS['medium']
+    predict = {'zeroshot': ensemble.predict_zero_shot, 'sentiment': ensemble.predict_sentiment}[voter]
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        n = 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            # Unique text per call so the batcher's memo never short-circuits
+            result = predict(f"{title} ({index}-{n})", content)
+            with lock:
+                latencies.append((time.perf_counter() - started) * 1000)
+                errors[0] += bool(result.get('error'))
+            n += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        'items_per_s': round(len(latencies) / wall, 1),
+        'p50_ms': round(statistics.median(ordered), 1),
+        'p95_ms': round(ordered[int(len(ordered) * 0.95)], 1),
+        'over_budget': errors[0],
+        'avg_batch': ensemble.pipeline_batchers[voter].stats()['avg_batch']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--voter', default='zeroshot', choices=['zeroshot', 'sentiment'])
+    parser.add_argument('--batch-sizes', default='1,4,8,16')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    logging.getLogger(app.__name__).setLevel(logging.WARNING)
+    ensemble = app.ensemble
+    if args.voter not in ensemble.pipeline_batchers:
+        sys.exit(f"Enable the voter first: {'ZERO_SHOT_VOTER' if args.voter == 'zeroshot' else 'SENTIMENT_VOTER'}=true")
+    ensemble.load_local_models()
+
+    run_batch = ensemble.pipeline_batchers[args.voter].run_batch
+    rows = []
+    for batch_size in [int(b) for b in args.batch_sizes.split(',')]:
+        # The batch functions chunk model calls by PIPELINE_BATCH_SIZE too
+        app.PIPELINE_BATCH_SIZE = batch_size
+        ensemble.pipeline_batchers[args.voter] = MicroBatcher(args.voter, run_batch, batch_size, app.PIPELINE_MAX_WAIT_MS)
+        row = drive(ensemble, args.voter, args.clients, args.duration)
+        rows.append(dict(row, batch_size=batch_size))
+        print(f"batch_size={batch_size:<3} {row['items_per_s']:>8} items/s  p50={row['p50_ms']}ms "
+              f"p95={row['p95_ms']}ms avg_batch={row['avg_batch']} over_budget={row['over_budget']}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'voter': args.voter, 'clients': args.clients, 'results': rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Throughput per core: threaded voters versus the inference process pool.
+
+Drives a local voter (the lexicon heuristic, or RoBERTa with --load-models)
+from concurrent client threads, first in-process and then through process
+pools of increasing size. For each configuration, reports requests/s, CPU
+cores actually used, requests/s per core, and memory (RSS, plus PSS for
+pool workers so copy-on-write sharing shows up).
+
+Usage (from python-service/):
+    python benchmarks/bench_process_pool.py --voter llama --workers 1,2,4,8 --clients 16
+    CUDA_VISIBLE_DEVICES= python benchmarks/bench_process_pool.py --voter roberta --load-models --workers 1,2,4
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import app
+from corpus import CORPUS
+from process_pool import _read_memory_kb
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+
+def cpu_seconds(pids):
+    """User + system CPU time consumed so far by the given processes"""
+    total = 0
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            total += int(fields[11]) + int(fields[12])  # utime, stime
+        except OSError:
+            pass
+    return total / CLOCK_TICKS
+
+
+def drive(ensemble, voter, clients, duration):
+    title, content = CORPUS['medium']
+    predict = {
+        'llama': ensemble.predict_llama_enhanced_fallback_only,
+        'roberta': ensemble.predict_roberta_local
+    }[voter]
+    completed = [0] * clients
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        while time.perf_counter() < deadline:
+            ensemble.call_voter(voter, predict, title, f"{content} ({index}-{completed[index]})")
+            completed[index] += 1
+
+    pids = [os.getpid()] + (ensemble.process_pool.pids if ensemble.process_pool else [])
+    cpu_before = cpu_seconds(pids)
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+    cores_used = (cpu_seconds(pids) - cpu_before) / wall
+
+    rps = sum(completed) / wall
+    workers_memory = [_read_memory_kb(pid) for pid in pids[1:]]
+    return {
+        'rps': round(rps, 1),
+        'cores_used': round(cores_used, 2),
+        'rps_per_core': round(rps / max(cores_used, 0.01), 1),
+        'parent_rss_mb': round(_read_memory_kb(os.getpid()).get('vmrss', 0) / 1024, 1),
+        'workers_rss_mb': round(sum(m.get('vmrss', 0) for m in workers_memory) / 1024, 1),
+        'workers_pss_mb': round(sum(m.get('pss', 0) for m in workers_memory) / 1024, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--voter', default='llama', choices=['llama', 'roberta'])
+    parser.add_argument('--workers', default='1,2,4', help='Process pool sizes to compare')
+    parser.add_argument('--threads-per-worker', type=int, default=1)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--load-models', action='store_true')
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    logging.getLogger(app.__name__).setLevel(logging.WARNING)
+    ensemble = app.ensemble
+    if args.load_models or args.voter == 'roberta':
+        ensemble.load_local_models()
+
+    rows = []
+    row = drive(ensemble, args.voter, args.clients, args.duration)
+    rows.append(dict(row, backend='thread', workers=0))
+    for workers in [int(w) for w in args.workers.split(',')]:
+        ensemble.start_process_pool(workers, args.threads_per_worker)
+        drive(ensemble, args.voter, args.clients, min(2.0, args.duration))  # warm up
+        row = drive(ensemble, args.voter, args.clients, args.duration)
+        rows.append(dict(row, backend='process', workers=workers))
+        ensemble.process_pool.shutdown()
+        ensemble.process_pool = None
+
+    print(f"voter={args.voter} clients={args.clients} cpus={os.cpu_count()}")
+    print(f"{'backend':<8} {'workers':>7} {'req/s':>9} {'cores':>6} {'req/s/core':>11} "
+          f"{'parent MB':>10} {'workers RSS':>12} {'workers PSS':>12}")
+    for row in rows:
+        print(f"{row['backend']:<8} {row['workers']:>7} {row['rps']:>9} {row['cores_used']:>6} "
+              f"{row['rps_per_core']:>11} {row['parent_rss_mb']:>10} {row['workers_rss_mb']:>12} "
+              f"{row['workers_pss_mb']:>12}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'voter': args.voter, 'clients': args.clients, 'results': rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Response size and serialization time for /analyze and /analyze-batch payloads.
+
+Builds full ensemble analyses from the sample voter outputs for each corpus
+size and serializes them as single and batch responses. Each payload is
+measured at full and compact verbosity, with Flask's default encoder (stdlib
+json, sorted keys) and with FastJSONProvider (orjson when installed).
+
+Usage (from python-service/):
+    python benchmarks/bench_responses.py --batch-size 5 --rounds 200
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import app
+import responses
+from corpus import CORPUS, SAMPLE_PREDICTIONS
+
+
+def flask_default_dumps(obj):
+    # What jsonify did before: stdlib json, compact, sorted keys
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def build_payloads(ensemble, batch_size):
+    payloads = {}
+    for size, (title, content) in CORPUS.items():
+        analysis = ensemble.aggregate_predictions(title, content, [dict(p) for p in SAMPLE_PREDICTIONS])
+        for verbosity, fields in responses.VERBOSITY_FIELDS.items():
+            projected = responses.project_analysis(analysis, fields)
+            payloads[f'analyze[{size},{verbosity}]'] = {
+                'success': True, 'analysis': projected, 'coalesced': False, 'processing_mode': 'full'
+            }
+            payloads[f'batch{batch_size}[{size},{verbosity}]'] = {
+                'success': True,
+                'results': [
+                    {'success': True, 'index': i, 'analysis': projected, 'processing_mode': 'full'}
+                    for i in range(batch_size)
+                ],
+                'batch_size': batch_size,
+                'successful_analyses': batch_size
+            }
+    return payloads
+
+
+def time_dumps(dumps, obj, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        body = dumps(obj)
+    return len(body), (time.perf_counter() - started) * 1000 / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--batch-size', type=int, default=5)
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    logging.getLogger(app.__name__).setLevel(logging.WARNING)
+    payloads = build_payloads(app.ensemble, args.batch_size)
+
+    rows = []
+    for name, payload in payloads.items():
+        default_bytes, default_ms = time_dumps(flask_default_dumps, payload, args.rounds)
+        fast_bytes, fast_ms = time_dumps(responses.dumps_bytes, payload, args.rounds)
+        rows.append({
+            'payload': name,
+            'bytes': fast_bytes,
+            'default_bytes': default_bytes,
+            'default_ms': round(default_ms, 4),
+            'fast_ms': round(fast_ms, 4),
+            'speedup': round(default_ms / max(fast_ms, 1e-9), 2)
+        })
+
+    print(f"json engine: {responses.FastJSONProvider.engine}")
+    print(f"{'payload':<28} {'bytes':>9} {'default ms':>11} {'fast ms':>9} {'speedup':>8}")
+    for row in rows:
+        print(f"{row['payload']:<28} {row['bytes']:>9} {row['default_ms']:>11} {row['fast_ms']:>9} {row['speedup']:>7}x")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'engine': responses.FastJSONProvider.engine, 'batch_size': args.batch_size, 'results': rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Throughput cost of sliding-window RoBERTa inference on CPU.
+
+Runs predict_roberta_local over a long synthetic article with windowing
+enabled and the window cap swept from 1 upwards, then reports latency,
+articles/s and the marginal cost of each additional window.
+
+Usage (from python-service/):
+    CUDA_VISIBLE_DEVICES= python benchmarks/bench_roberta_windows.py --max-windows 8 --iterations 20
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+PARAGRAPH = (
+    "The ministry confirmed in an official statement on Tuesday that the new policy "
+    "would take effect next month, according to documents reviewed by reporters. "
+    "Officials said the data, published by the national statistics agency, showed a "
+    "steady decline over the past five years. Independent researchers at the university "
+    "questioned the methodology, saying the findings relied on a limited sample. "
+)
+
+
+def build_article(paragraphs):
+    return "\n\n".join(PARAGRAPH for _ in range(paragraphs))
+
+
+def time_predict(ensemble, title, content, iterations):
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = ensemble.predict_roberta_local(title, content)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if result.get('error'):
+            raise RuntimeError(result['error'])
+    return latencies, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--max-windows', type=int, default=8)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--paragraphs', type=int, default=60)
+    parser.add_argument('--pooling', default='mean', choices=['mean', 'max', 'attention'])
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    ensemble = app.ensemble
+    ensemble.load_local_models()
+    if 'roberta' not in ensemble.models:
+        sys.exit("RoBERTa model failed to load")
+
+    title = "Ministry confirms new policy after statistics agency report"
+    content = build_article(args.paragraphs)
+    app.ROBERTA_WINDOWING = True
+    app.ROBERTA_POOLING = args.pooling
+
+    # Warm up kernels and allocator before measuring
+    time_predict(ensemble, title, content, 3)
+
+    rows = []
+    previous = None
+    for windows in range(1, args.max_windows + 1):
+        app.ROBERTA_MAX_WINDOWS = windows
+        latencies, result = time_predict(ensemble, title, content, args.iterations)
+        mean_ms = statistics.mean(latencies)
+        rows.append({
+            'windows': result.get('windows', windows),
+            'mean_ms': round(mean_ms, 2),
+            'p95_ms': round(sorted(latencies)[int(len(latencies) * 0.95) - 1], 2),
+            'articles_per_sec': round(1000 / mean_ms, 2),
+            'marginal_ms': round(mean_ms - previous, 2) if previous is not None else None
+        })
+        previous = mean_ms
+
+    print(f"device={app.device} pooling={args.pooling} iterations={args.iterations}")
+    print(f"{'windows':>8} {'mean ms':>10} {'p95 ms':>10} {'art/s':>8} {'+ms/window':>11}")
+    for row in rows:
+        marginal = '-' if row['marginal_ms'] is None else f"{row['marginal_ms']:.2f}"
+        print(f"{row['windows']:>8} {row['mean_ms']:>10.2f} {row['p95_ms']:>10.2f} "
+              f"{row['articles_per_sec']:>8.2f} {marginal:>11}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'device': app.device, 'pooling': args.pooling, 'results': rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
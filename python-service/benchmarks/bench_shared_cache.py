@@ -0,0 +1,115 @@
+"""
+Provider calls and cache hit rate across several replicas, per cache backend.
+
+Starts the fake providers and the fake Redis server, launches N replicas of
+app.py, and sends every article to each replica in turn, round-robin like
+a load balancer. The run is repeated for each cache backend. With 'memory'
+every replica pays for its own provider calls; with 'redis' the later
+replicas are served from the first one's verdict. Reports provider calls,
+the shared_cache stats from each replica's /health-detailed (hit rate and
+cross-replica hit rate per namespace), and p50 latency.
+
+Usage (from python-service/):
+    python benchmarks/bench_shared_cache.py --replicas 3 --articles 20 --backends memory,redis
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from fake_providers import add_fault_arguments, start_fake_providers
+from fake_redis import start_fake_redis
+from load_test import ARTICLE, http_json, start_service
+
+
+def provider_calls(stats):
+    return sum(sum(counts.values()) for counts in stats.snapshot().values())
+
+
+def run_backend(backend, args, base_urls, provider_stats, redis_url):
+    ports = [args.port + i for i in range(args.replicas)]
+    services = [
+        start_service(port, base_urls, False, {
+            'CACHE_BACKEND': backend,
+            'CACHE_URL': redis_url,
+            'CACHE_REPLICA_ID': f'replica-{i}',
+            'VERDICT_STORE': 'false'
+        })
+        for i, port in enumerate(ports)
+    ]
+
+    calls_before = provider_calls(provider_stats)
+    latencies = []
+    try:
+        for n in range(args.articles):
+            article = dict(ARTICLE, title=f"{ARTICLE['title']} ({backend} #{n})")
+            for r in range(args.replicas):
+                port = ports[(n + r) % len(ports)]
+                started = time.perf_counter()
+                http_json(f"http://127.0.0.1:{port}/analyze", article)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        replica_stats = [
+            http_json(f"http://127.0.0.1:{port}/health-detailed")[1]['performance']['shared_cache']
+            for port in ports
+        ]
+    finally:
+        for service in services:
+            service.terminate()
+            service.wait()
+
+    return {
+        'backend': backend,
+        'requests': len(latencies),
+        'provider_calls': provider_calls(provider_stats) - calls_before,
+        'p50_ms': round(statistics.median(latencies), 1),
+        'replicas': replica_stats
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--replicas', type=int, default=3)
+    parser.add_argument('--articles', type=int, default=20)
+    parser.add_argument('--backends', default='memory,redis')
+    parser.add_argument('--port', type=int, default=5201)
+    parser.add_argument('--json', help='Write results to this file')
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    fake_server, base_urls, provider_stats = start_fake_providers(
+        latency=args.latency, error_rate=args.error_rate,
+        burst_every=args.burst_every, burst_length=args.burst_length
+    )
+    redis_server, redis_url, _ = start_fake_redis()
+
+    rows = []
+    try:
+        for backend in args.backends.split(','):
+            rows.append(run_backend(backend, args, base_urls, provider_stats, redis_url))
+    finally:
+        fake_server.shutdown()
+        redis_server.shutdown()
+
+    for row in rows:
+        print(f"{row['backend']}: {row['requests']} requests, {row['provider_calls']} provider calls, "
+              f"p50={row['p50_ms']}ms")
+        for stats in row['replicas']:
+            verdict = stats['namespaces'].get('verdict', {})
+            search = stats['namespaces'].get('search', {})
+            print(f"  {stats['replica_id']:<10} verdict hit={verdict.get('hit_rate', 0):<6} "
+                  f"cross-replica={verdict.get('cross_replica_hit_rate', 0):<6} "
+                  f"search hit={search.get('hit_rate', 0):<6} errors={stats['errors']}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'replicas': args.replicas, 'articles': args.articles, 'results': rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
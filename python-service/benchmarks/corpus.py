@@ -0,0 +1,70 @@
+"""
+Deterministic article corpus for the hot-path microbenchmarks.
+
+Articles are assembled from realistic news and misinformation paragraphs so
+the lexicon scans see the same mix of indicator hits as production traffic.
+"""
+import random
+
+TRUSTED_PARAGRAPHS = [
+    "The health ministry confirmed in an official statement on Tuesday that vaccination "
+    "coverage rose to 87 percent, according to data published by the national statistics agency.",
+    "A spokesperson for the department said the investigation was ongoing and that further "
+    "findings would be released after review by an independent commission.",
+    "Researchers at the university, whose study was published in a peer-reviewed journal, "
+    "said the methodology relied on five years of hospital records.",
+    "Reuters and the Associated Press reported that the agency had verified the figures with "
+    "regional authorities before the press release was issued.",
+    "Economists cautioned that the statistics did not yet reflect the second quarter, and an "
+    "expert at the institute said the analysis should be treated as preliminary."
+]
+
+SUSPICIOUS_PARAGRAPHS = [
+    "SHOCKING: you won't believe what they don't want you to know about this miracle cure "
+    "that doctors hate!",
+    "This leaked bombshell exposes the hidden truth behind the cover-up, and it is going "
+    "viral right now. Click here before it gets deleted!",
+    "Incredible secret that the elites are hiding: an instant, guaranteed way to reverse "
+    "ageing overnight. Must watch!",
+    "Breaking exclusive: an explosive conspiracy has been uncovered and insiders say the "
+    "outrageous scheme is devastating for everyone involved.",
+    "Here are 7 reasons why this amazing trick will blow your mind, and number 4 is "
+    "unbelievable."
+]
+
+TITLES = {
+    'short': "Ministry confirms vaccination figures",
+    'medium': "Health ministry publishes vaccination data after audit",
+    'long': "Investigation: inside the five-year vaccination data programme"
+}
+
+
+def build_article(paragraphs, suspicious_ratio=0.2, seed=0):
+    """Assemble an article of `paragraphs` paragraphs with a given share of suspicious ones"""
+    rng = random.Random(seed)
+    parts = []
+    for _ in range(paragraphs):
+        pool = SUSPICIOUS_PARAGRAPHS if rng.random() < suspicious_ratio else TRUSTED_PARAGRAPHS
+        parts.append(rng.choice(pool))
+    return "\n\n".join(parts)
+
+
+# size -> (title, content); roughly 40, 400 and 12,000 words
+CORPUS = {
+    'short': (TITLES['short'], build_article(1, seed=1)),
+    'medium': (TITLES['medium'], build_article(12, seed=2)),
+    'long': (TITLES['long'], build_article(400, seed=3))
+}
+
+# Representative voter outputs for the ensemble aggregation benchmark
+SAMPLE_PREDICTIONS = [
+    {'model': 'LLaMA-Enhanced-Primary', 'label': 'Real', 'confidence': 78.0, 'reasoning': 'Enhanced analysis: Trust indicators: 6'},
+    {'model': 'OpenAI-GPT-3.5', 'label': 'Real', 'confidence': 82.0, 'reasoning': 'OpenAI analysis: cites official sources',
+     'token_usage': {'prompt_tokens': 410, 'completion_tokens': 60, 'total_tokens': 470, 'estimated': False}},
+    {'model': 'Groq-Mixtral', 'label': 'Fake', 'confidence': 64, 'reasoning': 'Groq analysis: VERDICT: Unreliable',
+     'token_usage': {'prompt_tokens': 398, 'completion_tokens': 48, 'total_tokens': 446, 'estimated': False}},
+    {'model': 'Search-Verification-Fixed', 'label': 'Real', 'confidence': 85.0, 'reasoning': 'Search verification: Found 3 trusted sources',
+     'search_details': {'trusted_sources': 3, 'total_results': 10, 'trust_ratio': 0.3, 'queries_tried': 2}},
+    {'model': 'RoBERTa-Local', 'label': 'Real', 'confidence': 91.2, 'reasoning': 'RoBERTa local model prediction: class 0',
+     'token_usage': {'input_tokens': 512, 'original_tokens': 900, 'budget': 512, 'windows': 1, 'truncated': True, 'estimated': False}}
+]
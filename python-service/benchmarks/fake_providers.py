@@ -0,0 +1,203 @@
+"""
+Local stand-in servers for the OpenAI, Groq and Serper endpoints.
+
+Each fake answers with a well-formed response after a configurable latency,
+and can inject random 5xx errors and periodic 429 rate-limit bursts. Point
+the service at them with OPENAI_BASE_URL, GROQ_BASE_URL and SERPER_BASE_URL.
+
+Usage (from python-service/):
+    python benchmarks/fake_providers.py --latency lognormal:400:0.5 --error-rate 0.02 \
+        --burst-every 30 --burst-length 3
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+OPENAI_REPLY = json.dumps({
+    'label': 'Trustworthy',
+    'confidence': 78,
+    'reasoning': 'Cites official sources and uses neutral language.',
+    'factual_score': 80,
+    'credibility_score': 76
+})
+
+GROQ_REPLY = (
+    "VERDICT: Reliable | CONFIDENCE: 74% | REASONING: Attributed quotes and "
+    "consistent figures; no sensationalist framing."
+)
+
+SERPER_RESULTS = [
+    {'title': 'Ministry confirms figures', 'link': 'https://www.reuters.com/world/example'},
+    {'title': 'Fact check: budget claims', 'link': 'https://apnews.com/article/example'},
+    {'title': 'Local coverage', 'link': 'https://example-news-blog.com/story'},
+    {'title': 'Statement from the ministry', 'link': 'https://pib.gov.in/release/example'},
+    {'title': 'Analysis of the report', 'link': 'https://www.thehindu.com/news/example'}
+]
+
+
+class LatencyModel:
+    """Latency distribution parsed from a spec such as "fixed:200", "uniform:100:500" or "lognormal:300:0.6" (ms)"""
+
+    def __init__(self, spec):
+        kind, *params = spec.split(':')
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        if kind not in ('fixed', 'uniform', 'lognormal'):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample_ms(self):
+        if self.kind == 'fixed':
+            return self.params[0]
+        if self.kind == 'uniform':
+            return random.uniform(self.params[0], self.params[1])
+        # lognormal: median in ms and sigma
+        median, sigma = self.params[0], self.params[1] if len(self.params) > 1 else 0.5
+        return random.lognormvariate(0, sigma) * median
+
+
+class FaultModel:
+    """Random 5xx errors plus periodic 429 bursts"""
+
+    def __init__(self, error_rate=0.0, burst_every=0.0, burst_length=0.0):
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.started = time.monotonic()
+
+    def status(self):
+        if self.burst_every and (time.monotonic() - self.started) % self.burst_every < self.burst_length:
+            return 429
+        if self.error_rate and random.random() < self.error_rate:
+            return 500
+        return 200
+
+
+class ProviderStats:
+    """Per-route request/status counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}
+
+    def record(self, route, status):
+        with self._lock:
+            route_counts = self.counts.setdefault(route, {})
+            route_counts[status] = route_counts.get(status, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return {route: dict(counts) for route, counts in self.counts.items()}
+
+
+def make_handler(latency, faults, stats):
+    class FakeProviderHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            if status == 429:
+                self.send_header('Retry-After', '1')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/stats':
+                return self._send(200, stats.snapshot())
+            return self._send(404, {'error': 'not found'})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+
+            if self.path.endswith('/chat/completions'):
+                route = 'groq' if self.path.startswith('/groq') else 'openai'
+            elif self.path.endswith('/search'):
+                route = 'serper'
+            else:
+                return self._send(404, {'error': 'not found'})
+
+            time.sleep(latency.sample_ms() / 1000)
+            status = faults.status()
+            stats.record(route, status)
+            if status == 429:
+                return self._send(429, {'error': {'message': 'Rate limit reached', 'type': 'rate_limit'}})
+            if status != 200:
+                return self._send(status, {'error': {'message': 'Injected server error'}})
+
+            if route == 'serper':
+                return self._send(200, {'organic': SERPER_RESULTS[:request.get('num', 5)]})
+
+            reply = GROQ_REPLY if route == 'groq' else OPENAI_REPLY
+            prompt_tokens = sum(len(m.get('content', '')) // 4 for m in request.get('messages', []))
+            completion_tokens = len(reply) // 4
+            return self._send(200, {
+                'id': 'chatcmpl-fake',
+                'object': 'chat.completion',
+                'model': request.get('model', 'fake'),
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': reply}, 'finish_reason': 'stop'}],
+                'usage': {
+                    'prompt_tokens': prompt_tokens,
+                    'completion_tokens': completion_tokens,
+                    'total_tokens': prompt_tokens + completion_tokens
+                }
+            })
+
+    return FakeProviderHandler
+
+
+def start_fake_providers(host='127.0.0.1', port=0, latency='fixed:200', error_rate=0.0,
+                         burst_every=0.0, burst_length=0.0):
+    """Start the fake provider server in a background thread; returns (server, base_urls, stats)"""
+    stats = ProviderStats()
+    handler = make_handler(LatencyModel(latency), FaultModel(error_rate, burst_every, burst_length), stats)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    root = f"http://{host}:{server.server_address[1]}"
+    base_urls = {
+        'OPENAI_BASE_URL': f"{root}/openai/v1",
+        'GROQ_BASE_URL': f"{root}/groq/openai/v1",
+        'SERPER_BASE_URL': f"{root}/serper"
+    }
+    return server, base_urls, stats
+
+
+def add_fault_arguments(parser):
+    parser.add_argument('--latency', default='lognormal:300:0.5',
+                        help='fixed:MS, uniform:MIN:MAX or lognormal:MEDIAN:SIGMA')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--burst-every', type=float, default=0.0, help='Seconds between 429 bursts (0 = off)')
+    parser.add_argument('--burst-length', type=float, default=0.0, help='Length of each 429 burst in seconds')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    server, base_urls, _ = start_fake_providers(
+        args.host, args.port, args.latency, args.error_rate, args.burst_every, args.burst_length
+    )
+    for name, url in base_urls.items():
+        print(f"export {name}={url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
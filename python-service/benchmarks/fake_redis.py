@@ -0,0 +1,133 @@
+"""
+Minimal in-memory Redis-protocol server for testing the shared cache.
+
+Implements the commands RedisCache uses (PING, AUTH, SELECT, GET, MGET, SET
+with EX/PX, DEL, DBSIZE, FLUSHALL), with key expiry, so several service
+replicas can share a cache without a real Redis installation.
+
+Usage (from python-service/):
+    python benchmarks/fake_redis.py --port 6390
+    CACHE_BACKEND=redis CACHE_URL=redis://127.0.0.1:6390/0 python app.py
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class FakeRedisStore:
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+        self.commands = 0
+
+    def _live(self, key, now):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at < now:
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, args):
+        command = args[0].upper().decode()
+        now = time.monotonic()
+        with self.lock:
+            self.commands += 1
+            if command == 'PING':
+                return '+PONG'
+            if command in ('AUTH', 'SELECT'):
+                return '+OK'
+            if command == 'GET':
+                return self._live(args[1], now)
+            if command == 'MGET':
+                return [self._live(key, now) for key in args[1:]]
+            if command == 'SET':
+                expires_at = None
+                options = [a.upper() for a in args[3:]]
+                if b'EX' in options:
+                    expires_at = now + int(args[3 + options.index(b'EX') + 1])
+                elif b'PX' in options:
+                    expires_at = now + int(args[3 + options.index(b'PX') + 1]) / 1000
+                self.data[args[1]] = (args[2], expires_at)
+                return '+OK'
+            if command == 'DEL':
+                return sum(self.data.pop(key, None) is not None for key in args[1:])
+            if command == 'DBSIZE':
+                return len(self.data)
+            if command == 'FLUSHALL':
+                self.data.clear()
+                return '+OK'
+        return f"-ERR unknown command '{command}'"
+
+
+def encode_reply(reply):
+    if isinstance(reply, str):  # status or error line
+        return f"{reply}\r\n".encode()
+    if reply is None:
+        return b'$-1\r\n'
+    if isinstance(reply, int):
+        return b':%d\r\n' % reply
+    if isinstance(reply, bytes):
+        return b'$%d\r\n%s\r\n' % (len(reply), reply)
+    return b'*%d\r\n' % len(reply) + b''.join(encode_reply(item) for item in reply)
+
+
+def make_handler(store):
+    class FakeRedisHandler(socketserver.StreamRequestHandler):
+        def read_command(self):
+            line = self.rfile.readline()
+            if not line:
+                return None
+            if not line.startswith(b'*'):  # inline command
+                return line.split()
+            args = []
+            for _ in range(int(line[1:-2])):
+                length = int(self.rfile.readline()[1:-2])
+                args.append(self.rfile.read(length + 2)[:-2])
+            return args
+
+        def handle(self):
+            while True:
+                args = self.read_command()
+                if args is None:
+                    return
+                if args:
+                    self.wfile.write(encode_reply(store.execute(args)))
+                    self.wfile.flush()
+
+    return FakeRedisHandler
+
+
+class ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def start_fake_redis(host='127.0.0.1', port=0):
+    """Start the server in a background thread; returns (server, url, store)"""
+    store = FakeRedisStore()
+    server = ThreadingTCPServer((host, port), make_handler(store))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"redis://{host}:{server.server_address[1]}/0", store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6390)
+    args = parser.parse_args()
+
+    server, url, _ = start_fake_redis(args.host, args.port)
+    print(f"export CACHE_BACKEND=redis CACHE_URL={url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""
+Load test for /analyze, /analyze-batch and /analyze-quick against fake providers.
+
+Starts the fake OpenAI/Groq/Serper servers, launches app.py pointed at them,
+then drives each endpoint at increasing concurrency. Reports RPS, p50/p95/p99,
+error counts and worker saturation (in-flight requests and inference queue
+depth sampled from /health-detailed). Results can be saved as a baseline and
+later runs compared against it.
+
+Usage (from python-service/):
+    python benchmarks/load_test.py --concurrency 1,4,16,32 --duration 20 --save-baseline benchmarks/baseline.json
+    python benchmarks/load_test.py --compare benchmarks/baseline.json --max-regression 0.15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from fake_providers import add_fault_arguments, start_fake_providers
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ARTICLE = {
+    'title': 'Ministry confirms revised budget figures after audit',
+    'content': (
+        "The finance ministry confirmed on Monday that revised budget figures would be "
+        "published next week, according to an official statement. The national audit office "
+        "said its investigation found discrepancies in two departments. Independent economists "
+        "at the university welcomed the additional data but questioned the methodology. "
+    ) * 4
+}
+
+ENDPOINTS = {
+    'analyze': ('/analyze', lambda i: dict(ARTICLE, title=f"{ARTICLE['title']} #{i}")),
+    'analyze-batch': ('/analyze-batch', lambda i: {
+        'articles': [dict(ARTICLE, title=f"{ARTICLE['title']} #{i}-{n}") for n in range(5)]
+    }),
+    'analyze-quick': ('/analyze-quick', lambda i: dict(ARTICLE, title=f"{ARTICLE['title']} #{i}"))
+}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def http_json(url, payload=None, timeout=60):
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return response.status, json.loads(response.read())
+
+
+def start_service(port, base_urls, local_models, extra_env=None):
+    env = dict(os.environ)
+    env.update(base_urls)
+    env.update(extra_env or {})
+    env.update({
+        'PYTHON_SERVICE_PORT': str(port),
+        'LOAD_LOCAL_MODELS': 'true' if local_models else 'false',
+        'OPENAI_API_KEY': env.get('LOADTEST_OPENAI_KEY', 'sk-loadtest'),
+        'GROQ_API_KEY': env.get('LOADTEST_GROQ_KEY', 'gsk-loadtest'),
+        'SERPER_API_KEY': env.get('LOADTEST_SERPER_KEY', 'serper-loadtest')
+    })
+    process = subprocess.Popen(
+        [sys.executable, 'app.py'], cwd=SERVICE_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + (600 if local_models else 60)
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"app.py exited with code {process.returncode}")
+        try:
+            _, health = http_json(f"http://127.0.0.1:{port}/health", timeout=2)
+            if health.get('ready'):
+                return process
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("app.py did not become ready in time")
+
+
+class SaturationSampler(threading.Thread):
+    """Polls /health-detailed for in-flight requests and inference queue depth"""
+
+    def __init__(self, base_url, interval=0.5):
+        super().__init__(daemon=True)
+        self.base_url = base_url
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                _, detail = http_json(f"{self.base_url}/health-detailed?reset_peak=true", timeout=5)
+                runtime = detail['performance']['runtime']
+                self.samples.append((runtime['requests']['peak_in_flight'], runtime['inference_queue_depth']))
+            except Exception:
+                pass
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def summary(self):
+        # Subtract the sampler's own request from the in-flight peak
+        in_flight = [max(0, peak - 1) for peak, _ in self.samples] or [0]
+        queue = [depth for _, depth in self.samples] or [0]
+        return {
+            'peak_in_flight': max(in_flight),
+            'mean_in_flight': round(statistics.mean(in_flight), 1),
+            'peak_inference_queue': max(queue)
+        }
+
+
+def run_level(base_url, endpoint, concurrency, duration):
+    path, make_payload = ENDPOINTS[endpoint]
+    latencies, errors = [], 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    counter = iter(range(10 ** 9))
+
+    def client():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            with lock:
+                payload = make_payload(next(counter))
+            start = time.perf_counter()
+            try:
+                status, body = http_json(f"{base_url}{path}", payload)
+                ok = status == 200 and body.get('success')
+            except Exception:
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors += 1
+
+    sampler = SaturationSampler(base_url)
+    sampler.start()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+    sampler.stop()
+
+    saturation = sampler.summary()
+    return {
+        'endpoint': endpoint,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / wall, 2),
+        'p50_ms': round(percentile(latencies, 50), 1),
+        'p95_ms': round(percentile(latencies, 95), 1),
+        'p99_ms': round(percentile(latencies, 99), 1),
+        'saturation': round(saturation['peak_in_flight'] / concurrency, 2),
+        **saturation
+    }
+
+
+def compare(results, baseline, max_regression):
+    """Return a list of regressions versus a stored baseline"""
+    previous = {(r['endpoint'], r['concurrency']): r for r in baseline['results']}
+    regressions = []
+    for row in results:
+        base = previous.get((row['endpoint'], row['concurrency']))
+        if not base:
+            continue
+        if base['rps'] and row['rps'] < base['rps'] * (1 - max_regression):
+            regressions.append(f"{row['endpoint']}@{row['concurrency']}: rps {base['rps']} -> {row['rps']}")
+        if base['p95_ms'] and row['p95_ms'] > base['p95_ms'] * (1 + max_regression):
+            regressions.append(f"{row['endpoint']}@{row['concurrency']}: p95 {base['p95_ms']}ms -> {row['p95_ms']}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS))
+    parser.add_argument('--concurrency', default='1,4,16')
+    parser.add_argument('--duration', type=float, default=15.0, help='Seconds per concurrency level')
+    parser.add_argument('--port', type=int, default=5101)
+    parser.add_argument('--local-models', action='store_true', help='Load local models in the service')
+    parser.add_argument('--save-baseline', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Baseline JSON file to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.15,
+                        help='Allowed fractional drop in RPS / rise in p95 before failing')
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    fake_server, base_urls, provider_stats = start_fake_providers(
+        latency=args.latency, error_rate=args.error_rate,
+        burst_every=args.burst_every, burst_length=args.burst_length
+    )
+    service = start_service(args.port, base_urls, args.local_models)
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    results = []
+    try:
+        for endpoint in args.endpoints.split(','):
+            for concurrency in [int(c) for c in args.concurrency.split(',')]:
+                row = run_level(base_url, endpoint, concurrency, args.duration)
+                results.append(row)
+                print(f"{endpoint:<14} c={concurrency:<3} rps={row['rps']:<7} p50={row['p50_ms']}ms "
+                      f"p95={row['p95_ms']}ms p99={row['p99_ms']}ms errors={row['errors']} "
+                      f"saturation={row['saturation']} queue={row['peak_inference_queue']}")
+    finally:
+        service.terminate()
+        service.wait()
+        fake_server.shutdown()
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {
+            'duration': args.duration,
+            'latency': args.latency,
+            'error_rate': args.error_rate,
+            'burst_every': args.burst_every,
+            'burst_length': args.burst_length,
+            'local_models': args.local_models
+        },
+        'provider_calls': provider_stats.snapshot(),
+        'results': results
+    }
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        if regressions:
+            print("Regressions versus baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions versus baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Replay captured inbound traffic against a build and compare latency.
+
+Reads the inbound.jsonl written by a service running with
+PROVIDER_CASSETTE_MODE=record, sends every request to a service running with
+PROVIDER_CASSETTE_MODE=replay (same recordings directory), and compares the
+new latencies with the ones captured at record time.
+
+Usage (from python-service/):
+    PROVIDER_CASSETTE_MODE=replay PROVIDER_REPLAY_LATENCY=zero python app.py &
+    python benchmarks/replay_traffic.py --recordings recordings --url http://127.0.0.1:5001 --concurrency 4
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def load_inbound(directory):
+    path = os.path.join(directory, 'inbound.jsonl')
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def replay(base_url, entries, concurrency):
+    results = [None] * len(entries)
+    next_index = iter(range(len(entries)))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                i = next(next_index, None)
+            if i is None:
+                return
+            entry = entries[i]
+            req = urllib.request.Request(
+                f"{base_url}{entry['path']}",
+                data=json.dumps(entry['payload']).encode('utf-8'),
+                headers={'Content-Type': 'application/json'}
+            )
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(req, timeout=120) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                status = e.code
+            except Exception:
+                status = None
+            results[i] = ((time.perf_counter() - start) * 1000, status)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recordings', default='recordings')
+    parser.add_argument('--url', default='http://127.0.0.1:5001')
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--json', help='Write the comparison to this file')
+    args = parser.parse_args()
+
+    entries = load_inbound(args.recordings)
+    if not entries:
+        sys.exit("No inbound requests recorded")
+
+    results = replay(args.url.rstrip('/'), entries, args.concurrency)
+    mismatched = sum(1 for entry, (_, status) in zip(entries, results) if status != entry['status_code'])
+
+    report = {'requests': len(entries), 'status_mismatches': mismatched, 'by_path': {}}
+    for path in sorted({e['path'] for e in entries}):
+        recorded = [e['elapsed_ms'] for e in entries if e['path'] == path]
+        replayed = [r[0] for e, r in zip(entries, results) if e['path'] == path]
+        report['by_path'][path] = {
+            'count': len(recorded),
+            'recorded_p50_ms': round(percentile(recorded, 50), 1),
+            'recorded_p95_ms': round(percentile(recorded, 95), 1),
+            'replayed_p50_ms': round(percentile(replayed, 50), 1),
+            'replayed_p95_ms': round(percentile(replayed, 95), 1)
+        }
+        row = report['by_path'][path]
+        print(f"{path:<16} n={row['count']:<5} recorded p50/p95 {row['recorded_p50_ms']}/{row['recorded_p95_ms']}ms  "
+              f"replayed p50/p95 {row['replayed_p50_ms']}/{row['replayed_p95_ms']}ms")
+    print(f"Status mismatches: {mismatched}/{len(entries)}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Record/replay of outbound provider calls for deterministic performance runs.
+
+In record mode every provider request made through CassetteStore.post() is
+sent for real and the response, status and latency are saved as one JSON
+file per interaction. In replay mode the same requests are answered from
+disk, either with their original latency or with none, so ensemble and
+serialization overhead can be profiled without network access.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+MODES = ('off', 'record', 'replay')
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """Raised in replay mode when no recording matches a request"""
+
+
+class ReplayResponse:
+    """Minimal stand-in for requests.Response built from a recording"""
+
+    def __init__(self, interaction):
+        self.status_code = interaction['status_code']
+        self.text = interaction['body']
+        self.headers = interaction.get('headers', {})
+        self.elapsed_ms = interaction['elapsed_ms']
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class CassetteStore:
+    """Directory of recorded provider interactions keyed on provider + request body"""
+
+    def __init__(self, directory, mode='off', replay_latency='original'):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.replay_latency = replay_latency  # 'original', 'zero' or a numeric scale factor
+        self._lock = threading.Lock()
+        self.stats = {'recorded': 0, 'replayed': 0, 'misses': 0, 'inbound_recorded': 0}
+        if mode != 'off':
+            os.makedirs(directory, exist_ok=True)
+            logger.info(f"📼 Provider cassettes: mode={mode} dir={directory}")
+
+    @property
+    def active(self):
+        return self.mode != 'off'
+
+    def _key(self, provider, payload):
+        # Each provider has a single endpoint and base URLs can be overridden,
+        # so the provider name plus the request body identifies an interaction
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        return f"{provider}-{hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:20]}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _write_json(self, path, data):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _read_json(self, path):
+        with open(path) as f:
+            return json.load(f)
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _replay_delay(self, elapsed_ms):
+        if self.replay_latency == 'original':
+            return elapsed_ms / 1000
+        if self.replay_latency == 'zero':
+            return 0
+        return elapsed_ms * float(self.replay_latency) / 1000
+
+    def post(self, provider, url, json=None, headers=None, timeout=None):
+        """Drop-in for requests.post() that records or replays according to the mode"""
+        if self.mode == 'off':
+            return requests.post(url, json=json, headers=headers, timeout=timeout)
+
+        key = self._key(provider, json)
+        if self.mode == 'replay':
+            try:
+                interaction = self._read_json(self._path(key))
+            except FileNotFoundError:
+                self._count('misses')
+                raise CassetteMiss(f"No recording for {provider} request {key}")
+            time.sleep(self._replay_delay(interaction['elapsed_ms']))
+            self._count('replayed')
+            return ReplayResponse(interaction)
+
+        start = time.perf_counter()
+        response = requests.post(url, json=json, headers=headers, timeout=timeout)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._write_json(self._path(key), {
+            'provider': provider,
+            'url': url,
+            'request': json,
+            'status_code': response.status_code,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() in ('content-type', 'retry-after')},
+            'body': response.text,
+            'elapsed_ms': round(elapsed_ms, 2),
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+        })
+        self._count('recorded')
+        return response
+
+    def record_inbound(self, path, payload, elapsed_ms, status_code):
+        """Append an inbound analysis request so production traffic can be replayed later"""
+        if self.mode != 'record':
+            return
+        line = json.dumps({
+            'path': path,
+            'payload': payload,
+            'elapsed_ms': round(elapsed_ms, 2),
+            'status_code': status_code,
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+        })
+        with self._lock:
+            with open(os.path.join(self.directory, 'inbound.jsonl'), 'a') as f:
+                f.write(line + '\n')
+            self.stats['inbound_recorded'] += 1
+
+    def summary(self):
+        with self._lock:
+            return {'mode': self.mode, 'directory': self.directory, 'replay_latency': self.replay_latency, **self.stats}
@@ -0,0 +1,267 @@
+"""
+Model registry with a memory budget and LRU unloading.
+
+Models are registered with a loader function instead of being held in a
+plain dict. The registry loads a model on first use and records its load
+time and resident size. While the total resident size exceeds the
+configured budget, it unloads the least-recently-used models. An unloaded
+model is reloaded transparently the next time it is looked up.
+
+The registry behaves like a read-mostly mapping (`name in registry`,
+`registry[name]`, `registry.get(name)`), so existing `self.models[...]`
+lookups keep working. `in` tests whether a model is registered, not
+whether it is resident.
+
+Code running a model holds it with `registry.lease(name)`. A leased
+(pinned) model is never evicted; a load that needs its memory waits a
+bounded time for the lease to be released before going over the budget.
+"""
+import gc
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+def process_rss_mb():
+    """Current resident set size of this process in MB (Linux), or None"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def torch_module_mb(obj):
+    """Parameter + buffer bytes of the torch module(s) inside a loaded model entry"""
+    modules = []
+    if isinstance(obj, dict):
+        modules = [v for k, v in obj.items() if k in ('model', 'eager_model')]
+    elif hasattr(obj, 'model'):
+        modules = [obj.model]  # transformers pipeline
+    elif hasattr(obj, 'parameters'):
+        modules = [obj]
+
+    seen, total = set(), 0
+    for module in modules:
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            if id(tensor) not in seen:
+                seen.add(id(tensor))
+                total += tensor.numel() * tensor.element_size()
+    return total / (1024 * 1024)
+
+
+class ModelEntry:
+    def __init__(self, name, loader, estimated_mb):
+        self.name = name
+        self.loader = loader
+        self.estimated_mb = estimated_mb
+        self.value = None
+        self.size_mb = None
+        self.rss_delta_mb = None
+        self.load_ms = None
+        self.load_count = 0
+        self.unload_count = 0
+        self.last_used = None
+        self.last_error = None
+        self.pins = 0
+        self.load_lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self.value is not None
+
+    @property
+    def expected_mb(self):
+        return self.size_mb or self.estimated_mb or 0
+
+
+class ModelRegistry:
+    """Lazily loaded models under a memory budget, evicted least-recently-used first"""
+
+    def __init__(self, budget_mb=0, pin_wait_s=5.0):
+        self.budget_mb = budget_mb  # 0 = unlimited
+        self.pin_wait_s = pin_wait_s
+        self._entries = OrderedDict()  # kept in LRU order, most recent last
+        self._lock = threading.Lock()
+        self._unpinned = threading.Condition(self._lock)
+        self.over_budget_loads = 0
+
+    def register(self, name, loader, estimated_mb=None):
+        with self._lock:
+            self._entries[name] = ModelEntry(name, loader, estimated_mb)
+
+    def unregister(self, name):
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __getitem__(self, name):
+        return self.acquire(name)
+
+    def get(self, name, default=None):
+        if name not in self._entries:
+            return default
+        try:
+            return self.acquire(name)
+        except Exception:
+            return default
+
+    def keys(self):
+        return list(self._entries)
+
+    def peek(self, name):
+        """Return a model only if it is already resident (never loads, doesn't touch the LRU order)"""
+        entry = self._entries.get(name)
+        return entry.value if entry else None
+
+    def is_loaded(self, name):
+        entry = self._entries.get(name)
+        return bool(entry and entry.loaded)
+
+    def resident_mb(self):
+        with self._lock:
+            return sum(e.size_mb or 0 for e in self._entries.values() if e.loaded)
+
+    def acquire(self, name, pin=False):
+        """Return a model, loading it (and evicting others to fit the budget) if needed"""
+        entry = self._entries[name]
+        while True:
+            with self._lock:
+                if entry.loaded:
+                    self._touch(entry)
+                    if pin:
+                        entry.pins += 1
+                    return entry.value
+
+            with entry.load_lock:
+                if not entry.loaded:
+                    self._make_room(entry.expected_mb, keep=name)
+                    self._load(entry)
+                    self._make_room(0, keep=name, wait=False)
+            # Loop: another load may have evicted it again before we could touch or pin it
+
+    def release(self, name):
+        """Drop one lease taken with acquire(pin=True)"""
+        entry = self._entries[name]
+        with self._lock:
+            entry.pins -= 1
+            self._unpinned.notify_all()
+
+    @contextmanager
+    def lease(self, name):
+        """Hold a model for the duration of a block; it cannot be evicted until the block exits"""
+        value = self.acquire(name, pin=True)
+        try:
+            yield value
+        finally:
+            self.release(name)
+
+    def _touch(self, entry):
+        entry.last_used = time.time()
+        self._entries.move_to_end(entry.name)
+
+    def _load(self, entry):
+        logger.info(f"📦 Loading model '{entry.name}'...")
+        rss_before = process_rss_mb()
+        started = time.perf_counter()
+        try:
+            value = entry.loader()
+        except Exception as e:
+            entry.last_error = str(e)[:200]
+            raise
+        entry.load_ms = round((time.perf_counter() - started) * 1000, 1)
+        rss_after = process_rss_mb()
+        try:
+            entry.size_mb = round(torch_module_mb(value), 1)
+        except Exception:
+            entry.size_mb = entry.estimated_mb
+        if rss_before is not None and rss_after is not None:
+            entry.rss_delta_mb = round(rss_after - rss_before, 1)
+        with self._lock:
+            entry.value = value
+            entry.load_count += 1
+            entry.last_error = None
+        logger.info(f"📦 Loaded '{entry.name}' in {entry.load_ms}ms ({entry.size_mb}MB)")
+
+    def _make_room(self, needed_mb, keep, wait=True):
+        """Unload least-recently-used models until `needed_mb` more fits in the budget"""
+        if not self.budget_mb:
+            return
+        deadline = time.monotonic() + (self.pin_wait_s if wait else 0)
+        while True:
+            with self._lock:
+                resident = sum(e.size_mb or 0 for e in self._entries.values() if e.loaded)
+                if resident + needed_mb <= self.budget_mb:
+                    return
+                candidates = [e for e in self._entries.values() if e.loaded and e.name != keep]
+                victim = next((e for e in candidates if not e.pins), None)
+                if victim is None:
+                    remaining = deadline - time.monotonic()
+                    if any(e.pins for e in candidates) and remaining > 0:
+                        # Everything evictable is in use; wait for a lease to end
+                        self._unpinned.wait(remaining)
+                        continue
+                    if needed_mb:
+                        self.over_budget_loads += 1
+                        logger.warning(f"⚠️ Model '{keep}' needs ~{needed_mb}MB, over the {self.budget_mb}MB budget")
+                    return
+            self.unload(victim.name)
+
+    def unload(self, name):
+        """Drop a resident model; returns False if it is not loaded or currently leased"""
+        entry = self._entries[name]
+        with self._lock:
+            if not entry.loaded or entry.pins:
+                return False
+            entry.value = None
+            entry.unload_count += 1
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+        logger.info(f"📤 Unloaded model '{name}' (LRU, budget {self.budget_mb}MB)")
+        return True
+
+    def reset_locks(self):
+        """Recreate locks after fork (a parent thread may have held them)"""
+        self._lock = threading.Lock()
+        self._unpinned = threading.Condition(self._lock)
+        for entry in self._entries.values():
+            entry.load_lock = threading.Lock()
+            entry.pins = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'budget_mb': self.budget_mb or None,
+                'resident_mb': round(sum(e.size_mb or 0 for e in self._entries.values() if e.loaded), 1),
+                'process_rss_mb': round(process_rss_mb() or 0, 1),
+                'over_budget_loads': self.over_budget_loads,
+                'models': {
+                    e.name: {
+                        'loaded': e.loaded,
+                        'leases': e.pins,
+                        'size_mb': e.size_mb,
+                        'estimated_mb': e.estimated_mb,
+                        'rss_delta_mb': e.rss_delta_mb,
+                        'load_ms': e.load_ms,
+                        'load_count': e.load_count,
+                        'unload_count': e.unload_count,
+                        'last_used': e.last_used,
+                        'last_error': e.last_error
+                    }
+                    for e in self._entries.values()
+                }
+            }
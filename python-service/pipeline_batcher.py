@@ -0,0 +1,145 @@
+"""
+Micro-batching for local pipeline voters.
+
+Requests that arrive concurrently (or the articles of one /analyze-batch
+call) are collected into batches of up to `batch_size` items. A batch is
+flushed when it is full or `max_wait_ms` after its first item arrived. A
+single worker thread then runs the batch through the model. `run_batch`
+may be a generator: each caller's future resolves as soon as its own
+output is yielded, so results stream back instead of waiting for the
+whole batch.
+
+Items are submitted with a key (e.g. a hash of the text). Submitting a key
+that is already queued or was recently computed attaches to the same
+computation. This lets a batch endpoint prefetch all its inputs up front,
+and the per-article ensemble runs then pick up those results. Every caller
+gets its own waiter future, so a caller that gives up cancels only its own
+wait; a queued item is skipped only once none of its waiters are left.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Collects concurrent submissions into batches for one model"""
+
+    def __init__(self, name, run_batch, batch_size=8, max_wait_ms=10, memo_size=256):
+        self.name = name
+        self.run_batch = run_batch
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self.memo_size = memo_size
+        self._queue = queue.Queue()
+        self._futures = OrderedDict()  # key -> shared Future, pending and recently completed
+        self._waiters = {}  # shared Future -> its callers' waiter futures, until it starts running
+        self._lock = threading.Lock()
+        self._thread = None
+        self.counts = {'items': 0, 'batches': 0, 'max_batch': 0, 'memo_hits': 0, 'cancelled': 0, 'errors': 0}
+        self._batch_ms = 0.0
+
+    def submit(self, key, item):
+        """Queue one item; returns this caller's own Future resolving to its output"""
+        waiter = Future()
+        with self._lock:
+            shared = self._futures.get(key)
+            failed = shared is not None and shared.done() and (shared.cancelled() or shared.exception() is not None)
+            queued = shared is None or failed
+            if queued:
+                shared = Future()
+                self._futures[key] = shared
+                self._waiters[shared] = []
+                while len(self._futures) > self.memo_size:
+                    self._futures.popitem(last=False)
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._loop, name=f'batcher-{self.name}', daemon=True)
+                    self._thread.start()
+            else:
+                self._futures.move_to_end(key)
+                self.counts['memo_hits'] += 1
+            if shared in self._waiters:
+                self._waiters[shared].append(waiter)
+        shared.add_done_callback(lambda done: self._resolve(waiter, done))
+        if queued:
+            self._queue.put((shared, item))
+        return waiter
+
+    @staticmethod
+    def _resolve(waiter, shared):
+        if not waiter.set_running_or_notify_cancel():
+            return  # this caller already gave up
+        if shared.cancelled():
+            waiter.set_exception(CancelledError())
+        elif shared.exception() is not None:
+            waiter.set_exception(shared.exception())
+        else:
+            waiter.set_result(shared.result())
+
+    def map(self, keyed_items):
+        """Queue several (key, item) pairs together so they share batches"""
+        return [self.submit(key, item) for key, item in keyed_items]
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            # Skip items whose callers all gave up (latency budget exceeded) before the batch ran
+            live = []
+            with self._lock:
+                for future, item in batch:
+                    waiters = self._waiters.pop(future)
+                    if all(w.cancelled() for w in waiters):
+                        future.cancel()
+                    if future.set_running_or_notify_cancel():
+                        live.append((future, item))
+                self.counts['cancelled'] += len(batch) - len(live)
+            if not live:
+                continue
+
+            started = time.perf_counter()
+            done = 0
+            try:
+                for output in self.run_batch([item for _, item in live]):
+                    live[done][0].set_result(output)
+                    done += 1
+                if done < len(live):
+                    raise RuntimeError(f"{self.name} batch returned {done} outputs for {len(live)} inputs")
+            except Exception as e:
+                logger.error(f"❌ {self.name} batch failed: {e}")
+                with self._lock:
+                    self.counts['errors'] += 1
+                for future, _ in live[done:]:
+                    future.set_exception(e)
+
+            with self._lock:
+                self.counts['items'] += len(live)
+                self.counts['batches'] += 1
+                self.counts['max_batch'] = max(self.counts['max_batch'], len(live))
+                self._batch_ms += (time.perf_counter() - started) * 1000
+
+    def stats(self):
+        with self._lock:
+            batches = self.counts['batches']
+            return dict(
+                self.counts,
+                batch_size=self.batch_size,
+                max_wait_ms=self.max_wait_ms,
+                queue_depth=self._queue.qsize(),
+                avg_batch=round(self.counts['items'] / batches, 2) if batches else 0.0,
+                avg_batch_ms=round(self._batch_ms / batches, 1) if batches else 0.0
+            )
@@ -0,0 +1,107 @@
+"""
+Process-pool execution backend for CPU-heavy voters.
+
+Local RoBERTa inference and the pure-Python lexicon heuristics contend on
+the GIL when run from Flask request threads. InferenceProcessPool hands those
+voters to long-lived worker processes instead. Requests and responses are
+small: the voter key and the title/content strings go in, and the result dict
+comes back.
+
+Where 'fork' is available, workers are forked after the parent has loaded
+its models, so the weights are shared copy-on-write and memory grows much
+less than linearly with the worker count. With 'spawn', each worker imports
+the service and loads its own models once at startup.
+"""
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Set in the parent before forking, or by the spawn initializer in each worker
+_worker_ensemble = None
+
+
+def _init_forked_worker(threads):
+    _worker_ensemble.reset_for_worker_process(threads)
+
+
+def _init_spawned_worker(threads):
+    global _worker_ensemble
+    import app
+    _worker_ensemble = app.ensemble
+    _worker_ensemble.load_local_models()
+    _worker_ensemble.reset_for_worker_process(threads)
+
+
+def _run_voter(voter, title, content):
+    return _worker_ensemble.run_local_voter(voter, title, content)
+
+
+def _worker_pid(_):
+    # Hold the worker briefly so concurrent calls land on distinct processes
+    time.sleep(0.1)
+    return os.getpid()
+
+
+def _read_memory_kb(pid):
+    """RSS and PSS (proportional share of shared pages) for a process, in kB"""
+    memory = {}
+    for filename, fields in (('status', ('VmRSS',)), ('smaps_rollup', ('Pss',))):
+        try:
+            with open(f'/proc/{pid}/{filename}') as f:
+                for line in f:
+                    key = line.split(':', 1)[0]
+                    if key in fields:
+                        memory[key.lower()] = int(line.split()[1])
+        except OSError:
+            pass
+    return memory
+
+
+class InferenceProcessPool:
+    """Long-lived worker processes that run local voters outside the GIL"""
+
+    def __init__(self, ensemble, workers, threads_per_worker=1, voters=('roberta', 'llama')):
+        global _worker_ensemble
+        self.workers = workers
+        self.voters = set(voters)
+        self.start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+
+        if self.start_method == 'fork':
+            _worker_ensemble = ensemble
+            initializer = _init_forked_worker
+        else:
+            initializer = _init_spawned_worker
+
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=initializer,
+            initargs=(threads_per_worker,)
+        )
+        # Start every worker now rather than on the first request
+        self.pids = sorted(set(self.executor.map(_worker_pid, range(workers))))
+        logger.info(f"🧮 Inference process pool: {workers} worker(s) via {self.start_method}, voters={sorted(self.voters)}")
+
+    def handles(self, voter):
+        return voter in self.voters
+
+    def run(self, voter, title, content):
+        return self.executor.submit(_run_voter, voter, title, content).result()
+
+    def stats(self):
+        workers = {pid: _read_memory_kb(pid) for pid in self.pids}
+        return {
+            'workers': self.workers,
+            'start_method': self.start_method,
+            'voters': sorted(self.voters),
+            'worker_memory_kb': workers,
+            'total_rss_kb': sum(m.get('vmrss', 0) for m in workers.values()),
+            'total_pss_kb': sum(m.get('pss', 0) for m in workers.values())
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
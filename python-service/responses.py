@@ -0,0 +1,126 @@
+"""
+Response shaping and JSON serialization for the analysis endpoints.
+
+Full /analyze responses carry every voter's prediction, reasoning and search
+details. Callers that only need the verdict can ask for a compact
+projection with `verbosity` or an explicit `fields` list. FastJSONProvider
+serializes with orjson when it is installed (falling back to compact stdlib
+json), skips key sorting, and records response bytes and serialization time
+per endpoint.
+"""
+import json
+import threading
+import time
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+VERBOSITY_FIELDS = {
+    'full': None,  # everything
+    'compact': ('label', 'confidence', 'summary'),
+}
+
+
+def parse_fields(data):
+    """Return the analysis keys requested via `fields` / `verbosity`, None for the full analysis"""
+    fields = (data or {}).get('fields')
+    if isinstance(fields, str):
+        fields = fields.split(',') if fields else []
+    if fields is not None and (not isinstance(fields, list) or not all(isinstance(f, str) for f in fields)):
+        raise ValueError("fields must be a comma-separated string or a list of strings")
+    if fields:
+        return tuple(f.strip() for f in fields if f and f.strip())
+
+    verbosity = (data or {}).get('verbosity') or 'full'
+    if verbosity not in VERBOSITY_FIELDS:
+        raise ValueError(f"verbosity must be one of: {', '.join(VERBOSITY_FIELDS)}")
+    return VERBOSITY_FIELDS[verbosity]
+
+
+def project_analysis(analysis, fields):
+    """Keep only the requested top-level keys of an analysis result"""
+    if fields is None or not isinstance(analysis, dict):
+        return analysis
+    return {key: analysis[key] for key in fields if key in analysis}
+
+
+class ResponseStats:
+    """Per-endpoint response size and serialization time"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, endpoint, size_bytes, serialize_ms):
+        with self._lock:
+            entry = self._stats.setdefault(endpoint, {
+                'responses': 0, 'total_bytes': 0, 'max_bytes': 0, 'total_serialize_ms': 0.0, 'max_serialize_ms': 0.0
+            })
+            entry['responses'] += 1
+            entry['total_bytes'] += size_bytes
+            entry['max_bytes'] = max(entry['max_bytes'], size_bytes)
+            entry['total_serialize_ms'] += serialize_ms
+            entry['max_serialize_ms'] = max(entry['max_serialize_ms'], serialize_ms)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                endpoint: {
+                    'responses': entry['responses'],
+                    'avg_bytes': round(entry['total_bytes'] / entry['responses']),
+                    'max_bytes': entry['max_bytes'],
+                    'avg_serialize_ms': round(entry['total_serialize_ms'] / entry['responses'], 3),
+                    'max_serialize_ms': round(entry['max_serialize_ms'], 3)
+                }
+                for endpoint, entry in self._stats.items()
+            }
+
+
+def dumps_bytes(obj):
+    """Serialize to compact UTF-8 JSON, with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=_default)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def _default(obj):
+    # numpy / torch scalars and anything else with .item() or .tolist()
+    for attr in ('item', 'tolist'):
+        if hasattr(obj, attr):
+            return getattr(obj, attr)()
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider: unsorted compact output via orjson, with size/time accounting"""
+
+    sort_keys = False
+    engine = 'orjson' if orjson is not None else 'json'
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.stats = ResponseStats()
+
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        from flask import request
+
+        obj = self._prepare_response_obj(args, kwargs)
+        started = time.perf_counter()
+        body = dumps_bytes(obj)
+        serialize_ms = (time.perf_counter() - started) * 1000
+        try:
+            endpoint = request.path
+        except RuntimeError:  # outside a request context
+            endpoint = None
+        if endpoint:
+            self.stats.record(endpoint, len(body), serialize_ms)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,314 @@
+"""
+Pluggable cache shared across service replicas.
+
+SharedCache is the interface: namespaced get/set with batched
+get_many/set_many, TTLs per namespace, and hit-rate accounting. Every
+value is stored with the id of the replica that wrote it. A hit on another
+replica's entry counts as a cross-replica hit; that is the provider spend
+that scaling out no longer duplicates.
+
+MemoryCache is process-local (the single-replica default). RedisCache
+speaks the Redis protocol (RESP) directly over a small connection pool,
+so no client library is needed. It works against a real Redis or the
+stand-in server in benchmarks/fake_redis.py. The cache is best-effort:
+backend errors are counted and treated as misses, and after an error the
+backend is skipped for a short cool-down.
+"""
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 3600
+
+
+class CacheError(Exception):
+    """Error reply from the cache server"""
+
+
+class SharedCache:
+    """Namespaced, batched cache interface with hit-rate accounting"""
+
+    backend = 'base'
+
+    def __init__(self, replica_id=None, ttls=None, prefix='truthly'):
+        self.replica_id = replica_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.ttls = dict(ttls or {})
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stats = {}
+        self.errors = 0
+        self.last_error = None
+
+    # Backend hooks: raw bytes in/out, keys already namespaced
+    def _get_raw(self, keys):
+        raise NotImplementedError
+
+    def _set_raw(self, blobs, ttl):
+        raise NotImplementedError
+
+    def _key(self, namespace, key):
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def get(self, namespace, key):
+        return self.get_many(namespace, [key]).get(key)
+
+    def set(self, namespace, key, value, ttl=None):
+        self.set_many(namespace, {key: value}, ttl)
+
+    def get_many(self, namespace, keys):
+        """Return {key: value} for the keys present; one round trip for the whole batch"""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        started = time.perf_counter()
+        try:
+            blobs = self._get_raw([self._key(namespace, k) for k in keys])
+        except Exception as e:
+            self._record_error(e)
+            blobs = [None] * len(keys)
+
+        results, cross_replica = {}, 0
+        for key, blob in zip(keys, blobs):
+            if blob is None:
+                continue
+            try:
+                envelope = json.loads(blob)
+            except ValueError:
+                continue
+            results[key] = envelope['v']
+            if envelope.get('o') != self.replica_id:
+                cross_replica += 1
+
+        with self._lock:
+            stats = self._namespace_stats(namespace)
+            stats['get_calls'] += 1
+            stats['batched_get_calls'] += len(keys) > 1
+            stats['lookups'] += len(keys)
+            stats['hits'] += len(results)
+            stats['cross_replica_hits'] += cross_replica
+            stats['get_ms'] += (time.perf_counter() - started) * 1000
+        return results
+
+    def set_many(self, namespace, items, ttl=None):
+        """Store {key: value}; values must be JSON-serializable"""
+        if not items:
+            return
+        ttl = ttl or self.ttls.get(namespace, DEFAULT_TTL)
+        blobs = {
+            self._key(namespace, key): json.dumps({'o': self.replica_id, 'v': value}, separators=(',', ':')).encode('utf-8')
+            for key, value in items.items()
+        }
+        try:
+            self._set_raw(blobs, ttl)
+        except Exception as e:
+            self._record_error(e)
+            return
+        with self._lock:
+            stats = self._namespace_stats(namespace)
+            stats['set_calls'] += 1
+            stats['sets'] += len(blobs)
+
+    def _namespace_stats(self, namespace):
+        if namespace not in self._stats:
+            self._stats[namespace] = {
+                'get_calls': 0, 'batched_get_calls': 0, 'lookups': 0, 'hits': 0,
+                'cross_replica_hits': 0, 'set_calls': 0, 'sets': 0, 'get_ms': 0.0
+            }
+        return self._stats[namespace]
+
+    def _record_error(self, error):
+        with self._lock:
+            self.errors += 1
+            self.last_error = str(error)[:200]
+        logger.warning(f"⚠️ {self.backend} cache error: {error}")
+
+    def stats(self):
+        with self._lock:
+            namespaces = {}
+            for namespace, s in self._stats.items():
+                lookups = s['lookups']
+                namespaces[namespace] = {
+                    'lookups': lookups,
+                    'hits': s['hits'],
+                    'cross_replica_hits': s['cross_replica_hits'],
+                    'hit_rate': round(s['hits'] / lookups, 3) if lookups else 0.0,
+                    'cross_replica_hit_rate': round(s['cross_replica_hits'] / lookups, 3) if lookups else 0.0,
+                    'sets': s['sets'],
+                    'batched_get_calls': s['batched_get_calls'],
+                    'avg_get_ms': round(s['get_ms'] / s['get_calls'], 3) if s['get_calls'] else 0.0
+                }
+            return {
+                'backend': self.backend,
+                'replica_id': self.replica_id,
+                'ttls': self.ttls,
+                'errors': self.errors,
+                'last_error': self.last_error,
+                'namespaces': namespaces
+            }
+
+
+class MemoryCache(SharedCache):
+    """In-process LRU cache with per-entry expiry"""
+
+    backend = 'memory'
+
+    def __init__(self, max_entries=10000, **kwargs):
+        super().__init__(**kwargs)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._entries_lock = threading.Lock()
+
+    def _get_raw(self, keys):
+        now = time.monotonic()
+        blobs = []
+        with self._entries_lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None or entry[0] < now:
+                    self._entries.pop(key, None)
+                    blobs.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    blobs.append(entry[1])
+        return blobs
+
+    def _set_raw(self, blobs, ttl):
+        expires_at = time.monotonic() + ttl
+        with self._entries_lock:
+            for key, blob in blobs.items():
+                self._entries[key] = (expires_at, blob)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        stats = super().stats()
+        stats['entries'] = len(self._entries)
+        return stats
+
+
+class _RespConnection:
+    """One blocking Redis-protocol connection; supports pipelined commands"""
+
+    def __init__(self, host, port, timeout):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile('rb')
+
+    @staticmethod
+    def _encode(args):
+        out = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode('utf-8')
+            out.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        return b''.join(out)
+
+    def _read_reply(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError('Connection closed by cache server')
+        prefix, rest = line[:1], line[1:-2]
+        if prefix == b'+':
+            return rest.decode('utf-8')
+        if prefix == b'-':
+            raise CacheError(rest.decode('utf-8'))
+        if prefix == b':':
+            return int(rest)
+        if prefix == b'$':
+            length = int(rest)
+            return None if length < 0 else self.reader.read(length + 2)[:-2]
+        if prefix == b'*':
+            length = int(rest)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise CacheError(f"Unexpected reply: {line[:40]!r}")
+
+    def pipeline(self, commands):
+        self.sock.sendall(b''.join(self._encode(c) for c in commands))
+        return [self._read_reply() for _ in commands]
+
+    def execute(self, *args):
+        return self.pipeline([args])[0]
+
+    def close(self):
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RedisCache(SharedCache):
+    """Cache on a Redis-protocol server, shared by every replica pointed at it"""
+
+    backend = 'redis'
+
+    def __init__(self, url='redis://127.0.0.1:6379/0', timeout=0.5, max_idle=8, cooldown=2.0, **kwargs):
+        super().__init__(**kwargs)
+        parts = urlsplit(url)
+        self.url = url
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.db = int(parts.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self.cooldown = cooldown
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+        self._down_until = 0.0
+
+    def _connect(self):
+        conn = _RespConnection(self.host, self.port, self.timeout)
+        if self.password:
+            conn.execute('AUTH', self.password)
+        if self.db:
+            conn.execute('SELECT', self.db)
+        return conn
+
+    def _pipeline(self, commands):
+        if time.monotonic() < self._down_until:
+            raise ConnectionError("cache server cooling down after an error")
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+        try:
+            conn = conn or self._connect()
+            replies = conn.pipeline(commands)
+        except (OSError, CacheError):
+            if conn:
+                conn.close()
+            self._down_until = time.monotonic() + self.cooldown
+            raise
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+        return replies
+
+    def _get_raw(self, keys):
+        return self._pipeline([['MGET', *keys]])[0]
+
+    def _set_raw(self, blobs, ttl):
+        self._pipeline([['SET', key, blob, 'EX', int(ttl)] for key, blob in blobs.items()])
+
+    def stats(self):
+        stats = super().stats()
+        stats['url'] = f"redis://{self.host}:{self.port}/{self.db}"
+        return stats
+
+
+def create_cache(backend, url=None, max_entries=10000, replica_id=None, ttls=None):
+    """Build the configured cache backend ('memory' or 'redis')"""
+    if backend == 'redis':
+        return RedisCache(url or 'redis://127.0.0.1:6379/0', replica_id=replica_id, ttls=ttls)
+    if backend == 'memory':
+        return MemoryCache(max_entries, replica_id=replica_id, ttls=ttls)
+    raise ValueError(f"Unknown cache backend '{backend}'. Available: memory, redis")
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the test run self-contained: no on-disk verdict store, no local models
+os.environ.setdefault('VERDICT_STORE', 'false')
+os.environ.setdefault('LOAD_LOCAL_MODELS', 'false')
+
+
+@pytest.fixture
+def app_module():
+    import app
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    app_module.app.config['TESTING'] = True
+    return app_module.app.test_client()
@@ -0,0 +1,34 @@
+// Runs Truthly-extension/content.js canonicalization and Bloom lookup over the shared fixture;
+// prints one JSON result object for tests/test_verdict_store.py to compare
+const fs = require('fs');
+const path = require('path');
+const vm = require('vm');
+const { webcrypto } = require('crypto');
+
+const source = fs.readFileSync(path.join(__dirname, '..', '..', 'Truthly-extension', 'content.js'), 'utf8');
+const fixture = JSON.parse(fs.readFileSync(path.join(__dirname, 'fixtures', 'url_canonicalization.json'), 'utf8'));
+
+const context = vm.createContext({
+  URL, TextEncoder, atob, BigInt, Uint8Array, console,
+  crypto: webcrypto,
+  window: { location: { hostname: 'localhost' } }  // keeps the script from starting itself
+});
+const TruthlyExtension = vm.runInContext(`${source}\n;TruthlyExtension`, context);
+const extension = Object.create(TruthlyExtension.prototype);
+extension.useVerdictBloom({ ...fixture.bloom, loadedAt: Date.now() });
+
+(async () => {
+  const urls = [];
+  for (const { url } of fixture.urls) {
+    urls.push({ url, canonical: extension.canonicalizeUrl(url), in_bloom: await extension.mightHaveVerdict(url) });
+  }
+  const invalid = fixture.invalid.map((url) => {
+    try {
+      extension.canonicalizeUrl(url);
+      return false;
+    } catch (error) {
+      return true;
+    }
+  });
+  console.log(JSON.stringify({ urls, invalid }));
+})();
@@ -0,0 +1,33 @@
+import pytest
+
+from admission import AdmissionController, PriorityClass
+
+
+@pytest.fixture
+def overloaded(app_module, monkeypatch):
+    """No free slots and no queue, so every interactive request is degraded"""
+    ensemble = app_module.ensemble
+    monkeypatch.setattr(ensemble, 'admission', AdmissionController(0, [
+        PriorityClass('interactive', max_queue=0, queue_timeout_ms=0),
+        PriorityClass('batch', max_queue=0, queue_timeout_ms=0)
+    ]))
+    monkeypatch.setattr(ensemble, 'predict_llama_enhanced_fallback_only', lambda title, content: {
+        'model': 'Llama-Enhanced-Fallback', 'label': 'Real', 'confidence': 80.0, 'reasoning': 'test'
+    })
+    return ensemble
+
+
+def test_degraded_result_uses_ensemble_labels(overloaded):
+    result, mode = overloaded.analyze_admitted('Ministry confirms budget', 'Officials announced the figures.')
+    assert mode == 'quick_degraded'
+    assert result['label'] == 'Trustworthy'
+    assert result['real_probability'] == 100.0
+    assert result['ensemble_details']['total_predictions'] == 1
+
+
+def test_degraded_analyze_response(overloaded, client):
+    response = client.post('/analyze', json={'title': 'Shocking cure', 'content': 'Doctors hate this secret.'})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['processing_mode'] == 'quick_degraded'
+    assert body['analysis']['label'] in ('Trustworthy', 'Untrustworthy')
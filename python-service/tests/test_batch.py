@@ -0,0 +1,18 @@
+def test_articles_must_be_a_list(client):
+    response = client.post('/analyze-batch', json={'articles': 'abc'})
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_malformed_articles_fail_per_index(client):
+    response = client.post('/analyze-batch', json={'articles': [
+        'abc',
+        {'title': 'Ministry confirms budget', 'content': 'Officials announced the figures.'},
+        {'title': 5, 'content': 'Not a string title'}
+    ]})
+    body = response.get_json()
+    assert response.status_code == 200
+    by_index = {r['index']: r for r in body['results']}
+    assert by_index[0]['success'] is False
+    assert by_index[1]['success'] is True
+    assert by_index[2]['success'] is False
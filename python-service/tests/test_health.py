@@ -0,0 +1,18 @@
+def test_healthy_without_startup_hook(client):
+    # Served by a WSGI runner that never calls startup(): nothing is warming up
+    body = client.get('/health').get_json()
+    assert body['status'] == 'healthy'
+    assert body['ready'] is True
+
+
+def test_warming_up_while_models_load(app_module, client, monkeypatch):
+    seen = []
+    monkeypatch.setattr(app_module.ensemble, 'configure_inference_threads',
+                        lambda: seen.append(client.get('/health').get_json()['status']))
+    monkeypatch.setattr(app_module, 'LOCAL_PIPELINES', [])
+    monkeypatch.setattr(app_module, 'MODEL_PRELOAD', [])
+    monkeypatch.setattr(app_module, 'MODEL_WARMUP', False)
+    monkeypatch.setattr(app_module.ensemble, 'models', app_module.ModelRegistry())
+    app_module.ensemble.load_local_models()
+    assert seen == ['warming_up']
+    assert client.get('/health').get_json()['status'] == 'healthy'
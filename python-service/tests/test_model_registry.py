@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+from model_registry import ModelRegistry
+
+torch = pytest.importorskip('torch')
+
+
+def small_model():
+    return torch.nn.Linear(400, 400)  # ~0.6 MB of parameters
+
+
+@pytest.fixture
+def registry():
+    registry = ModelRegistry(budget_mb=1, pin_wait_s=0.2)
+    registry.register('a', small_model, 0.6)
+    registry.register('b', small_model, 0.6)
+    return registry
+
+
+def test_lru_model_is_evicted(registry):
+    registry.acquire('a')
+    registry.acquire('b')
+    assert not registry.is_loaded('a')
+    assert registry.is_loaded('b')
+
+
+def test_leased_model_is_never_evicted(registry):
+    with registry.lease('a') as model:
+        registry.acquire('b')
+        assert registry.is_loaded('a')
+        assert registry.unload('a') is False
+        assert model is registry.peek('a')
+    assert registry.stats()['over_budget_loads'] == 1
+    assert registry.unload('a') is True
+
+
+def test_load_waits_for_lease_release(registry):
+    registry.pin_wait_s = 5
+    registry.acquire('a', pin=True)
+    threading.Timer(0.1, registry.release, args=('a',)).start()
+    registry.acquire('b')
+    assert not registry.is_loaded('a')
+    assert registry.stats()['over_budget_loads'] == 0
+
+
+def test_loaded_models_follow_the_registry(app_module, monkeypatch, registry):
+    monkeypatch.setattr(app_module.ensemble, 'models', registry)
+    registry.acquire('a')
+    assert app_module.ensemble.loaded_models == ['a-Local']
+    registry.acquire('b')
+    assert app_module.ensemble.loaded_models == ['b-Local']
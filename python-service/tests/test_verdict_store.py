@@ -0,0 +1,81 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from verdict_store import BloomFilter, VerdictStore, canonicalize_url, url_hash
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+with open(os.path.join(TESTS_DIR, 'fixtures', 'url_canonicalization.json'), encoding='utf-8') as f:
+    FIXTURE = json.load(f)
+
+
+@pytest.mark.parametrize('case', FIXTURE['urls'], ids=lambda case: case['url'])
+def test_canonical_form_matches_fixture(case):
+    assert canonicalize_url(case['url']) == case['canonical']
+
+
+@pytest.mark.parametrize('url', FIXTURE['invalid'])
+def test_url_without_host_is_rejected(url):
+    with pytest.raises(ValueError):
+        canonicalize_url(url)
+
+
+def test_bloom_layout_matches_fixture():
+    spec = FIXTURE['bloom']
+    bloom = BloomFilter(spec['capacity'], spec['error_rate'])
+    assert (bloom.size, bloom.hashes) == (spec['size'], spec['hashes'])
+    for case in FIXTURE['urls']:
+        if case['in_bloom']:
+            bloom.add(url_hash(case['url']))
+    assert bloom.export()['bits'] == spec['bits']
+    assert [url_hash(case['url']) in bloom for case in FIXTURE['urls']] == [c['in_bloom'] for c in FIXTURE['urls']]
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+def test_extension_matches_fixture():
+    output = subprocess.run(
+        ['node', os.path.join(TESTS_DIR, 'content_parity.js')],
+        capture_output=True, text=True, check=True, timeout=30
+    ).stdout
+    result = json.loads(output)
+    assert result['urls'] == FIXTURE['urls']
+    assert all(result['invalid'])
+
+
+def test_store_round_trip(tmp_path):
+    store = VerdictStore(str(tmp_path / 'verdicts.sqlite3'), ttl_seconds=3600, bloom_capacity=100)
+    store.put('https://www.example.com/story/?utm_source=feed', {'label': 'Trustworthy', 'confidence': 80})
+    found = store.lookup('https://example.com/story')
+    assert found['analysis']['label'] == 'Trustworthy'
+    assert store.lookup('https://example.com/other') is None
+
+
+def test_maintenance_purges_expired_rows_and_rebuilds_bloom(tmp_path):
+    store = VerdictStore(str(tmp_path / 'verdicts.sqlite3'), ttl_seconds=3600, bloom_capacity=100)
+    stale = url_hash('https://example.com/stale')
+    store.put('https://example.com/stale', {'label': 'Untrustworthy'})
+    store.put('https://example.com/fresh', {'label': 'Trustworthy'})
+    with store._connection() as conn:
+        conn.execute('UPDATE verdicts SET analyzed_at = analyzed_at - 7200 WHERE url_hash = ?', (stale,))
+
+    assert store.maintain()
+    assert stale not in store.bloom
+    assert url_hash('https://example.com/fresh') in store.bloom
+    assert store._connection().execute('SELECT COUNT(*) FROM verdicts').fetchone()[0] == 1
+    stats = store.stats()
+    assert (stats['purged'], stats['entries']) == (1, 1)
+
+
+def test_bloom_grows_when_it_passes_capacity(tmp_path):
+    store = VerdictStore(str(tmp_path / 'verdicts.sqlite3'), ttl_seconds=0, bloom_capacity=10)
+    urls = [f'https://example.com/story/{i}' for i in range(25)]
+    for url in urls:
+        store.put(url, {'label': 'Trustworthy'})
+    assert store.bloom.capacity >= store.bloom.count == 25
+    assert all(url_hash(url) in store.bloom for url in urls)
+    # A reopened store indexes only what is in the table
+    assert VerdictStore(store.path, ttl_seconds=0, bloom_capacity=10).stats()['entries'] == 25
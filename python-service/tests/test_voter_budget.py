@@ -0,0 +1,20 @@
+import pytest
+
+from voter_policy import parse_budget
+
+ARTICLE = {'title': 'Ministry confirms budget', 'content': 'Officials announced the figures.'}
+
+
+@pytest.mark.parametrize('value', ['abc', -1, [], {}, True, 'nan'])
+def test_invalid_budget_is_rejected(client, value):
+    for key in ('budget_ms', 'budget_usd'):
+        response = client.post('/analyze', json=dict(ARTICLE, **{key: value}))
+        assert response.status_code == 400
+        assert key in response.get_json()['error']
+
+
+def test_parse_budget_accepts_numbers():
+    assert parse_budget({}, 'budget_ms') is None
+    assert parse_budget({'budget_ms': 250}, 'budget_ms') == 250.0
+    assert parse_budget({'budget_usd': '0.01'}, 'budget_usd') == 0.01
+    assert parse_budget({'budget_usd': 0}, 'budget_usd') == 0.0
@@ -0,0 +1,314 @@
+"""
+Persistent URL-keyed verdict store with a Bloom-filter precheck.
+
+Verdicts are kept in a local SQLite database. Each row is indexed by the
+SHA-256 of the canonical URL. A Bloom filter over those hashes answers
+"never seen" without touching the database. The filter can also be
+exported, so that callers (the extension) can skip the lookup request
+entirely for URLs that were never scored.
+
+URL canonicalization and the Bloom filter bit layout are mirrored in
+Truthly-extension/content.js. Keep the two in sync.
+"""
+import base64
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+try:
+    import idna
+except ImportError:  # ships with requests
+    idna = None
+
+logger = logging.getLogger(__name__)
+
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', 'ref_src'}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+# WHATWG path and special-scheme query percent-encode sets, beyond controls, space and non-ASCII
+PATH_ENCODE_SET = frozenset('"#<>?`{}')
+QUERY_ENCODE_SET = frozenset('"#<>\'')
+
+# Analysis keys persisted per verdict
+STORED_FIELDS = ('label', 'confidence', 'summary', 'reasoning', 'real_probability', 'fake_probability')
+
+
+def canonicalize_url(url):
+    """Canonical form used as the store key: lowercase punycode host without www., no default port,
+    fragment or tracking parameters, dot segments resolved, WHATWG percent-encoding, sorted query
+    and no trailing slash; raises ValueError for URLs without a scheme and host"""
+    url = url.strip().replace('\t', '').replace('\n', '').replace('\r', '')
+    if url[:url.find(':') + 1].lower() in ('http:', 'https:'):
+        # Web URLs treat backslashes before the query as slashes
+        end = min((i for i in (url.find('?'), url.find('#')) if i >= 0), default=len(url))
+        url = url[:end].replace('\\', '/') + url[end:]
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.hostname:
+        raise ValueError(f"not an absolute URL with a host: {url[:100]!r}")
+    scheme = parts.scheme.lower()
+    host = _ascii_host(parts.hostname)
+    if host.startswith('www.'):
+        host = host[4:]
+    if ':' in host:
+        host = f"[{host}]"  # IPv6 literal
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = _percent_encode(_remove_dot_segments(parts.path or '/'), PATH_ENCODE_SET)
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+
+    params = sorted(
+        pair for pair in _percent_encode(parts.query, QUERY_ENCODE_SET).split('&')
+        if pair and not _is_tracking_param(pair.split('=', 1)[0])
+    )
+    query = f"?{'&'.join(params)}" if params else ''
+    return f"{scheme}://{host}{path}{query}"
+
+
+def _ascii_host(host):
+    # Browsers hand out IDN hosts in punycode (xn--...) using UTS #46; the stdlib codec is the older IDNA 2003
+    host = host.lower()
+    if host.isascii():
+        return host
+    try:
+        if idna is not None:
+            return idna.encode(host, uts46=True, transitional=False).decode('ascii')
+        return host.encode('idna').decode('ascii')
+    except (UnicodeError, ValueError):
+        return host
+
+
+def _percent_encode(text, encode_set):
+    # Controls, space, non-ASCII and the set's characters become %XX of their UTF-8 bytes;
+    # existing escapes are left alone, as the URL parser does
+    return ''.join(
+        ''.join(f'%{byte:02X}' for byte in ch.encode('utf-8'))
+        if ch <= ' ' or ch > '~' or ch in encode_set else ch
+        for ch in text
+    )
+
+
+def _remove_dot_segments(path):
+    segments = path.split('/')[1:] if path.startswith('/') else path.split('/')
+    output = []
+    for i, segment in enumerate(segments):
+        last = i == len(segments) - 1
+        if segment.lower() in ('..', '.%2e', '%2e.', '%2e%2e'):
+            if output:
+                output.pop()
+            if last:
+                output.append('')
+        elif segment.lower() in ('.', '%2e'):
+            if last:
+                output.append('')
+        else:
+            output.append(segment)
+    return '/' + '/'.join(output)
+
+
+def _is_tracking_param(key):
+    key = key.lower()
+    return key.startswith('utm_') or key in TRACKING_PARAMS
+
+
+def url_hash(url):
+    return hashlib.sha256(canonicalize_url(url).encode('utf-8')).hexdigest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over hex SHA-256 keys (double hashing on the digest)"""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _indexes(self, key):
+        digest = bytes.fromhex(key)
+        h1 = int.from_bytes(digest[0:8], 'big')
+        h2 = int.from_bytes(digest[8:16], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for index in self._indexes(key):
+            self.bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(key))
+
+    def etag(self):
+        """Validator for the exported filter; changes whenever a bit does"""
+        return hashlib.sha1(self.bits).hexdigest()[:16]
+
+    def export(self):
+        return {
+            'size': self.size,
+            'hashes': self.hashes,
+            'entries': self.count,
+            'bits': base64.b64encode(bytes(self.bits)).decode('ascii')
+        }
+
+
+class VerdictStore:
+    """SQLite-backed verdict index keyed by canonical URL hash"""
+
+    def __init__(self, path, ttl_seconds, bloom_capacity=100000, bloom_error_rate=0.01, maintenance_interval=3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.maintenance_interval = maintenance_interval
+        self.bloom = BloomFilter(bloom_capacity, bloom_error_rate)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._maintenance_lock = threading.Lock()
+        self._pending_keys = None  # keys written while a rebuild scans the table
+        self._maintained_at = 0.0
+        self.counts = {'lookups': 0, 'hits': 0, 'misses': 0, 'bloom_negative': 0, 'bloom_false_positive': 0,
+                       'expired': 0, 'writes': 0, 'purged': 0, 'rebuilds': 0}
+        self._lookup_ms = 0.0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS verdicts (
+                    url_hash TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    label TEXT,
+                    confidence REAL,
+                    analysis TEXT NOT NULL,
+                    analyzed_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS verdicts_analyzed_at ON verdicts (analyzed_at)')
+        self.maintain()
+        logger.info(f"🗂️ Verdict store at {path}: {self.bloom.count} verdict(s) indexed")
+
+    def _connection(self):
+        # sqlite3 connections can't be shared across threads; keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def lookup(self, url):
+        """Return the stored verdict for a URL, or None; the Bloom filter rejects unseen URLs first"""
+        started = time.perf_counter()
+        key = url_hash(url)
+        result = None
+        self._count('lookups')
+        if key not in self.bloom:
+            self._count('bloom_negative')
+        else:
+            row = self._connection().execute(
+                'SELECT url, analysis, analyzed_at FROM verdicts WHERE url_hash = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self._count('bloom_false_positive')
+            elif self.ttl_seconds and time.time() - row[2] > self.ttl_seconds:
+                self._count('expired')
+            else:
+                result = {'url': row[0], 'url_hash': key, 'analysis': json.loads(row[1]), 'analyzed_at': row[2]}
+        self._count('hits' if result else 'misses')
+        with self._lock:
+            self._lookup_ms += (time.perf_counter() - started) * 1000
+        self._maintain_if_due()
+        return result
+
+    def put(self, url, analysis):
+        """Write (or refresh) the verdict for a URL"""
+        key = url_hash(url)
+        stored = {k: analysis[k] for k in STORED_FIELDS if k in analysis}
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO verdicts (url_hash, url, label, confidence, analysis, analyzed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, canonicalize_url(url), stored.get('label'), stored.get('confidence'),
+                 json.dumps(stored, separators=(',', ':')), time.time())
+            )
+        with self._lock:
+            if key not in self.bloom:
+                self.bloom.add(key)
+            if self._pending_keys is not None:
+                self._pending_keys.append(key)
+            self.counts['writes'] += 1
+        self._maintain_if_due()
+        return key
+
+    def _maintain_if_due(self):
+        if self.bloom.count > self.bloom.capacity or (
+                self.maintenance_interval and time.time() - self._maintained_at > self.maintenance_interval):
+            self.maintain(wait=False)
+
+    def maintain(self, wait=True):
+        """Delete expired verdicts and rebuild the Bloom filter from the live rows
+
+        The new filter is sized for at least twice the live rows, so a store that outgrows its
+        configured capacity keeps its error rate. Returns False if another thread is already at it.
+        """
+        if not self._maintenance_lock.acquire(blocking=wait):
+            return False
+        try:
+            conn = self._connection()
+            purged = 0
+            if self.ttl_seconds:
+                with conn:
+                    purged = conn.execute(
+                        'DELETE FROM verdicts WHERE analyzed_at < ?', (time.time() - self.ttl_seconds,)
+                    ).rowcount
+            with self._lock:
+                self._pending_keys = []
+            try:
+                keys = [key for (key,) in conn.execute('SELECT url_hash FROM verdicts')]
+                bloom = BloomFilter(max(self.bloom_capacity, 2 * len(keys)), self.bloom_error_rate)
+                for key in keys:
+                    bloom.add(key)
+                with self._lock:
+                    for key in self._pending_keys:
+                        if key not in bloom:
+                            bloom.add(key)
+                    self.bloom = bloom
+                    self.counts['purged'] += purged
+                    self.counts['rebuilds'] += 1
+            finally:
+                with self._lock:
+                    self._pending_keys = None
+            self._maintained_at = time.time()
+            if purged:
+                logger.info(f"🧹 Verdict store: purged {purged} expired verdict(s), {bloom.count} indexed")
+            return True
+        finally:
+            self._maintenance_lock.release()
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self.counts)
+            lookup_ms = self._lookup_ms
+            bloom = self.bloom
+        return dict(
+            counts,
+            path=self.path,
+            entries=bloom.count,
+            bloom_capacity=bloom.capacity,
+            bloom_size_bytes=len(bloom.bits),
+            bloom_hashes=bloom.hashes,
+            avg_lookup_ms=round(lookup_ms / counts['lookups'], 3) if counts['lookups'] else 0.0
+        )
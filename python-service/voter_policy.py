@@ -0,0 +1,183 @@
+"""
+Cost- and latency-aware voter selection for the ensemble.
+
+VoterStats keeps running (EWMA) estimates of each voter's latency, cost per
+call, success rate and agreement with the final verdict, learned from
+observed calls. A VoterPolicy turns those estimates plus a per-request
+budget into a plan: which voters to run and which to skip.
+"""
+import math
+import threading
+
+# Priors used until a voter has been observed: latency (ms), cost (USD/call),
+# success rate and agreement with the final ensemble verdict
+VOTER_PRIORS = {
+    'llama': {'latency_ms': 5.0, 'cost_usd': 0.0, 'success': 1.0, 'agreement': 0.7},
+    'openai': {'latency_ms': 1500.0, 'cost_usd': 0.0012, 'success': 0.9, 'agreement': 0.8},
+    'groq': {'latency_ms': 600.0, 'cost_usd': 0.0004, 'success': 0.9, 'agreement': 0.75},
+    'search': {'latency_ms': 2500.0, 'cost_usd': 0.002, 'success': 0.9, 'agreement': 0.75},
+    'roberta': {'latency_ms': 150.0, 'cost_usd': 0.0, 'success': 0.95, 'agreement': 0.7},
+    'zeroshot': {'latency_ms': 120.0, 'cost_usd': 0.0, 'success': 0.95, 'agreement': 0.65},
+    'sentiment': {'latency_ms': 40.0, 'cost_usd': 0.0, 'success': 0.95, 'agreement': 0.55},
+}
+DEFAULT_PRIOR = {'latency_ms': 1000.0, 'cost_usd': 0.0, 'success': 0.9, 'agreement': 0.7}
+
+
+class VoterStats:
+    """Thread-safe exponentially weighted estimates per voter"""
+
+    def __init__(self, alpha=0.2):
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _entry(self, voter):
+        if voter not in self._stats:
+            prior = VOTER_PRIORS.get(voter, DEFAULT_PRIOR)
+            self._stats[voter] = dict(prior, calls=0)
+        return self._stats[voter]
+
+    def _update(self, entry, field, value):
+        entry[field] = (1 - self.alpha) * entry[field] + self.alpha * value
+
+    def record_call(self, voter, latency_ms, cost_usd, success):
+        with self._lock:
+            entry = self._entry(voter)
+            entry['calls'] += 1
+            self._update(entry, 'latency_ms', latency_ms)
+            self._update(entry, 'success', 1.0 if success else 0.0)
+            if success:
+                self._update(entry, 'cost_usd', cost_usd)
+
+    def record_agreement(self, voter, agreed):
+        with self._lock:
+            self._update(self._entry(voter), 'agreement', 1.0 if agreed else 0.0)
+
+    def estimate(self, voter):
+        with self._lock:
+            return dict(self._entry(voter))
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                voter: {
+                    'calls': entry['calls'],
+                    'latency_ms': round(entry['latency_ms'], 1),
+                    'cost_usd': round(entry['cost_usd'], 6),
+                    'success_rate': round(entry['success'], 3),
+                    'agreement_rate': round(entry['agreement'], 3)
+                }
+                for voter, entry in self._stats.items()
+            }
+
+
+class VoterPolicy:
+    """Base policy: decides which of the available voters run for one request"""
+
+    name = 'base'
+    uses_budget = True
+
+    def __init__(self, stats, required=('llama',)):
+        self.stats = stats
+        self.required = set(required)
+
+    def select(self, voters, budget_ms=None, budget_usd=None):
+        raise NotImplementedError
+
+    def plan(self, voters, budget_ms=None, budget_usd=None):
+        """Return a plan dict with the selected voters and the reasoning behind the selection"""
+        estimates = {v: self.stats.estimate(v) for v in voters}
+        selected = self.select(voters, budget_ms, budget_usd)
+        return {
+            'policy': self.name,
+            'budget_ms': budget_ms if self.uses_budget else None,
+            'budget_usd': budget_usd if self.uses_budget else None,
+            'selected': selected,
+            'skipped': [v for v in voters if v not in selected],
+            'expected_latency_ms': round(sum(estimates[v]['latency_ms'] for v in selected), 1),
+            'expected_cost_usd': round(sum(estimates[v]['cost_usd'] for v in selected), 6)
+        }
+
+
+class AllVotersPolicy(VoterPolicy):
+    """Run every available voter regardless of budget (the original behaviour)"""
+
+    name = 'all'
+    uses_budget = False
+
+    def select(self, voters, budget_ms=None, budget_usd=None):
+        return list(voters)
+
+
+class BudgetVoterPolicy(VoterPolicy):
+    """Greedily pick the voters with the best expected agreement per unit of budget"""
+
+    name = 'budget'
+
+    def value(self, estimate):
+        return estimate['agreement'] * estimate['success']
+
+    def select(self, voters, budget_ms=None, budget_usd=None):
+        if budget_ms is None and budget_usd is None:
+            return list(voters)
+
+        estimates = {v: self.stats.estimate(v) for v in voters}
+        selected = [v for v in voters if v in self.required]
+        spent_ms = sum(estimates[v]['latency_ms'] for v in selected)
+        spent_usd = sum(estimates[v]['cost_usd'] for v in selected)
+
+        def budget_share(voter):
+            # Fraction of the remaining budget(s) this voter would consume
+            share = 0.0
+            if budget_ms:
+                share += estimates[voter]['latency_ms'] / budget_ms
+            if budget_usd:
+                share += estimates[voter]['cost_usd'] / budget_usd
+            return max(share, 1e-6)
+
+        candidates = sorted(
+            (v for v in voters if v not in self.required),
+            key=lambda v: self.value(estimates[v]) / budget_share(v),
+            reverse=True
+        )
+        for voter in candidates:
+            latency, cost = estimates[voter]['latency_ms'], estimates[voter]['cost_usd']
+            if budget_ms is not None and spent_ms + latency > budget_ms:
+                continue
+            if budget_usd is not None and spent_usd + cost > budget_usd:
+                continue
+            selected.append(voter)
+            spent_ms += latency
+            spent_usd += cost
+
+        # Preserve the configured voter order for execution
+        return [v for v in voters if v in selected]
+
+
+def parse_budget(data, key):
+    """Read an optional non-negative numeric budget (e.g. budget_ms) from a request body"""
+    value = (data or {}).get(key)
+    if value is None:
+        return None
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        budget = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be a number")
+    if not math.isfinite(budget) or budget < 0:
+        raise ValueError(f"{key} must be a non-negative number")
+    return budget
+
+
+VOTER_POLICIES = {
+    AllVotersPolicy.name: AllVotersPolicy,
+    BudgetVoterPolicy.name: BudgetVoterPolicy,
+}
+
+
+def create_policy(name, stats):
+    """Instantiate a registered policy by name"""
+    if name not in VOTER_POLICIES:
+        raise ValueError(f"Unknown voter policy '{name}'. Available: {', '.join(VOTER_POLICIES)}")
+    return VOTER_POLICIES[name](stats)